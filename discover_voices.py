@@ -5,33 +5,38 @@ and tests TTS with the correct voice ID.
 """
 
 import asyncio
+import logging
+import aiofiles
 import os
+import sys
 from fixed_murf_client import FixedMurfAPIClient
 
+logger = logging.getLogger(__name__)
+
 async def discover_and_test_voices():
     """Discover available voices and test TTS"""
     
-    print("🔍 MURF VOICE DISCOVERY")
-    print("=" * 50)
+    logger.info("🔍 MURF VOICE DISCOVERY")
+    logger.info("=" * 50)
     
     # Get API key
     api_key = os.getenv('MURF_API_KEY', 'your_murf_key_here')
-    print(f"🔑 Using API key: {api_key[:15]}...")
+    logger.info(f"🔑 Using API key: {api_key[:15]}...")
     
     # Create client
     murf_client = FixedMurfAPIClient(api_key)
     
     if not murf_client.available:
-        print("❌ Murf client not available")
-        return False
+        logger.error("❌ Murf client not available")
+        return False, None
     
     # Step 1: Get available voices
-    print("\n1️⃣ Fetching available voices...")
+    logger.info("\n1️⃣ Fetching available voices...")
     voices_result = await murf_client.get_available_voices()
     
     if voices_result["success"]:
         voices = voices_result["voices"]
-        print(f"✅ Found {len(voices)} available voices:")
+        logger.info(f"✅ Found {len(voices)} available voices:")
         
         english_voices = []
         for i, voice in enumerate(voices[:10]):  # Show first 10
@@ -40,65 +45,62 @@ async def discover_and_test_voices():
             language = voice.get('language', 'Unknown')
             gender = voice.get('gender', 'Unknown')
             
-            print(f"   {i+1}. ID: {voice_id}")
-            print(f"      Name: {voice_name}")
-            print(f"      Language: {language}")
-            print(f"      Gender: {gender}")
-            print()
+            logger.info(f"   {i+1}. ID: {voice_id}")
+            logger.info(f"      Name: {voice_name}")
+            logger.info(f"      Language: {language}")
+            logger.info(f"      Gender: {gender}")
+            logger.info("")
             
             # Collect English voices
             if 'en' in language.lower() or 'english' in language.lower():
                 english_voices.append(voice_id)
         
         if english_voices:
-            print(f"🎯 English voices found: {english_voices[:3]}")
+            logger.info(f"🎯 English voices found: {english_voices[:3]}")
             
-            # Step 2: Test with first English voice
-            test_voice_id = english_voices[0]
-            print(f"\n2️⃣ Testing TTS with voice: {test_voice_id}")
+            # Step 2: Test up to three English voices concurrently
+            candidate_voices = english_voices[:3]
+            logger.info(f"\n2️⃣ Testing TTS with voices: {candidate_voices}")
             
-            test_result = await murf_client.text_to_speech(
-                "Hello! This is a test of the Murf voice system with the correct voice ID.",
-                test_voice_id
+            test_results = await asyncio.gather(
+                *[
+                    murf_client.text_to_speech(
+                        "Hello! This is a test of the Murf voice system with the correct voice ID.",
+                        voice_id
+                    )
+                    for voice_id in candidate_voices
+                ],
+                return_exceptions=True
             )
             
-            if test_result["success"]:
-                print("🎉 SUCCESS! TTS is now working!")
-                print(f"   Audio file: {test_result['audio_path']}")
-                print(f"   Audio URL: {test_result['audio_url']}")
-                
-                # Update your .env file suggestion
-                print(f"\n📝 UPDATE YOUR .env FILE:")
-                print(f"DEFAULT_VOICE_ID={test_voice_id}")
-                
-                return True, test_voice_id
-            else:
-                print(f"❌ TTS still failed: {test_result['error']}")
-                
-                # Try another voice
-                if len(english_voices) > 1:
-                    print(f"\n🔄 Trying backup voice: {english_voices[1]}")
-                    backup_result = await murf_client.text_to_speech(
-                        "Testing backup voice",
-                        english_voices[1]
-                    )
+            # Prefer the earliest candidate that worked
+            for voice_id, test_result in zip(candidate_voices, test_results):
+                if isinstance(test_result, dict) and test_result.get("success"):
+                    logger.info(f"🎉 SUCCESS! TTS is now working with voice: {voice_id}")
+                    logger.info(f"   Audio file: {test_result['audio_path']}")
+                    logger.info(f"   Audio URL: {test_result['audio_url']}")
+                    
+                    # Update your .env file suggestion
+                    logger.info(f"\n📝 UPDATE YOUR .env FILE:")
+                    logger.info(f"DEFAULT_VOICE_ID={voice_id}")
                     
-                    if backup_result["success"]:
-                        print("🎉 SUCCESS with backup voice!")
-                        print(f"📝 USE THIS VOICE ID: {english_voices[1]}")
-                        return True, english_voices[1]
+                    return True, voice_id
+            
+            for voice_id, test_result in zip(candidate_voices, test_results):
+                error = test_result.get("error") if isinstance(test_result, dict) else test_result
+                logger.error(f"❌ TTS failed for {voice_id}: {error}")
         else:
-            print("❌ No English voices found")
+            logger.error("❌ No English voices found")
     
     else:
-        print(f"❌ Failed to get voices: {voices_result['error']}")
+        logger.error(f"❌ Failed to get voices: {voices_result['error']}")
     
     return False, None
 
 async def update_voice_config(working_voice_id: str):
     """Update configuration with working voice ID"""
     
-    print(f"\n🔧 Updating configuration with working voice ID: {working_voice_id}")
+    logger.info(f"\n🔧 Updating configuration with working voice ID: {working_voice_id}")
     
     # Update the fixed client default
     config_update = f'''
@@ -109,14 +111,11 @@ DEFAULT_VOICE_ID = "{working_voice_id}"
 self.default_voice_id = "{working_voice_id}"
 '''
     
-    print(config_update)
+    logger.info(config_update)
     
     # Try to update the integration file
     try:
-        with open("voice_fix_integration.py", "r") as f:
-            content = f.read()
-        
-        # Add voice ID configuration
+        # Add voice ID configuration - later definitions win on re-runs
         addition = f'''
 # WORKING VOICE ID DISCOVERED
 WORKING_VOICE_ID = "{working_voice_id}"
@@ -125,15 +124,13 @@ def get_working_voice_id():
     return WORKING_VOICE_ID
 '''
         
-        content = content + addition
-        
-        with open("voice_fix_integration.py", "w") as f:
-            f.write(content)
+        async with aiofiles.open("voice_fix_integration.py", "a") as f:
+            await f.write(addition)
         
-        print("✅ Updated voice_fix_integration.py with working voice ID")
+        logger.info("✅ Updated voice_fix_integration.py with working voice ID")
         
     except Exception as e:
-        print(f"⚠️ Could not auto-update config: {e}")
+        logger.warning(f"⚠️ Could not auto-update config: {e}")
 
 async def main():
     """Main discovery process"""
@@ -144,16 +141,16 @@ async def main():
         if success and working_voice_id:
             await update_voice_config(working_voice_id)
             
-            print("\n🎉 VOICE SYSTEM FULLY FIXED!")
-            print("=" * 50)
-            print("📋 FINAL STEPS:")
-            print(f"1. Your working voice ID is: {working_voice_id}")
-            print("2. Restart your server: python main.py")
-            print("3. Test at: http://localhost:8000/api/voice/test")
-            print("4. The voice system should now show ✅ in logs")
+            logger.info("\n🎉 VOICE SYSTEM FULLY FIXED!")
+            logger.info("=" * 50)
+            logger.info("📋 FINAL STEPS:")
+            logger.info(f"1. Your working voice ID is: {working_voice_id}")
+            logger.info("2. Restart your server: python main.py")
+            logger.info("3. Test at: http://localhost:8000/api/voice/test")
+            logger.info("4. The voice system should now show ✅ in logs")
             
             # Test one more time to confirm
-            print(f"\n🧪 Final confirmation test...")
+            logger.info(f"\n🧪 Final confirmation test...")
             api_key = os.getenv('MURF_API_KEY', 'your_murf_key_here')
             client = FixedMurfAPIClient(api_key)
             client.default_voice_id = working_voice_id  # Use discovered voice
@@ -164,22 +161,39 @@ async def main():
             )
             
             if final_test["success"]:
-                print("🎉 FINAL TEST PASSED! System is ready!")
+                logger.info("🎉 FINAL TEST PASSED! System is ready!")
             else:
-                print(f"⚠️ Final test issue: {final_test['error']}")
+                logger.warning(f"⚠️ Final test issue: {final_test['error']}")
         
         else:
-            print("\n❌ Voice discovery failed")
-            print("📝 Troubleshooting:")
-            print("   1. Check your Murf API key is valid")
-            print("   2. Verify your Murf account has TTS access")
-            print("   3. Check internet connectivity")
-            print("   4. Visit https://murf.ai/api/docs/voices-styles/voice-library")
+            logger.error("\n❌ Voice discovery failed")
+            logger.warning("📝 Troubleshooting:")
+            logger.warning("   1. Check your Murf API key is valid")
+            logger.warning("   2. Verify your Murf account has TTS access")
+            logger.warning("   3. Check internet connectivity")
+            logger.warning("   4. Visit https://murf.ai/api/docs/voices-styles/voice-library")
     
     except Exception as e:
-        print(f"❌ Discovery failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error(f"❌ Discovery failed: {e}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.exception("Discovery traceback")
 
 if __name__ == "__main__":
+    # Progress output is chatty on a terminal and quiet (warnings and
+    # errors only) when piped, unless LOG_LEVEL says otherwise. force=True
+    # replaces the handler fixed_murf_client installs on import
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL") or ("INFO" if sys.stdout.isatty() else "WARNING"),
+        format="%(message)s",
+        stream=sys.stdout,
+        force=True
+    )
+    
+    # uvloop ships with uvicorn[standard]; fall back to the default loop without it
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     asyncio.run(main())
\ No newline at end of file
@@ -14,7 +14,10 @@ REAL_VOICE_IDS = [
     "en-US-imani"
 ]
 
-async def test_real_voice(api_key: str, voice_id: str) -> bool:
+# Probes share one connection pool; at most this many run at once
+MAX_CONCURRENT_PROBES = 4
+
+async def test_real_voice(session: aiohttp.ClientSession, api_key: str, voice_id: str) -> bool:
     """Test with your real voice IDs using minimal payload"""
     
     try:
@@ -29,31 +32,29 @@ async def test_real_voice(api_key: str, voice_id: str) -> bool:
             "Content-Type": "application/json"
         }
         
-        print(f"Testing {voice_id}... ", end="")
-        
         # Short timeout to avoid hanging
         timeout = aiohttp.ClientTimeout(total=8)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(
-                "https://api.murf.ai/v1/speech/generate",
-                json=payload,
-                headers=headers
-            ) as response:
-                
-                if response.status == 200:
-                    data = await response.json()
-                    if "audioFile" in data:
-                        print("✅ WORKS!")
-                        return True
-                
-                print(f"❌ Status: {response.status}")
-                return False
+        async with session.post(
+            "https://api.murf.ai/v1/speech/generate",
+            json=payload,
+            headers=headers,
+            timeout=timeout
+        ) as response:
+            
+            if response.status == 200:
+                data = await response.json()
+                if "audioFile" in data:
+                    print(f"Testing {voice_id}... ✅ WORKS!")
+                    return True
+            
+            print(f"Testing {voice_id}... ❌ Status: {response.status}")
+            return False
     
     except asyncio.TimeoutError:
-        print("❌ Timeout")
+        print(f"Testing {voice_id}... ❌ Timeout")
         return False
     except Exception as e:
-        print(f"❌ Error: {str(e)[:20]}")
+        print(f"Testing {voice_id}... ❌ Error: {str(e)[:20]}")
         return False
 
 async def find_best_voice():
@@ -67,27 +68,51 @@ async def find_best_voice():
     
     print(f"🧪 Testing {len(REAL_VOICE_IDS)} real voice IDs from your account...")
     
-    for voice_id in REAL_VOICE_IDS:
-        success = await test_real_voice(api_key, voice_id)
+    # One session for every probe - a single TLS handshake per pooled
+    # connection instead of one per request
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT_PROBES, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+        
+        async def probe(voice_id: str) -> bool:
+            async with semaphore:
+                return await test_real_voice(session, api_key, voice_id)
         
-        if success:
+        # The probes are independent - run them together and take the first
+        # voice that answers, cancelling the probes still in flight
+        tasks = {asyncio.create_task(probe(voice_id)): voice_id for voice_id in REAL_VOICE_IDS}
+        voice_id = None
+        
+        try:
+            pending = set(tasks)
+            while pending and voice_id is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.result():
+                        voice_id = tasks[task]
+                        break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        if voice_id:
             print(f"\n🎉 FOUND WORKING VOICE: {voice_id}")
             
-            # Test with longer text
+            # Test with longer text - only the winner needs it
             print("🧪 Testing with longer text...")
-            longer_success = await test_longer_text(api_key, voice_id)
+            longer_success = await test_longer_text(session, api_key, voice_id)
             
             if longer_success:
                 print("✅ Longer text works too!")
-                return voice_id
             else:
                 print("⚠️ Longer text failed, but short text works")
-                return voice_id  # Return it anyway
+            return voice_id  # Return it anyway
     
     print("\n❌ None of your real voices worked")
     return None
 
-async def test_longer_text(api_key: str, voice_id: str) -> bool:
+async def test_longer_text(session: aiohttp.ClientSession, api_key: str, voice_id: str) -> bool:
     """Test with interview-length text"""
     
     try:
@@ -102,18 +127,18 @@ async def test_longer_text(api_key: str, voice_id: str) -> bool:
         }
         
         timeout = aiohttp.ClientTimeout(total=15)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(
-                "https://api.murf.ai/v1/speech/generate",
-                json=payload,
-                headers=headers
-            ) as response:
-                
-                if response.status == 200:
-                    data = await response.json()
-                    return "audioFile" in data
-                
-                return False
+        async with session.post(
+            "https://api.murf.ai/v1/speech/generate",
+            json=payload,
+            headers=headers,
+            timeout=timeout
+        ) as response:
+            
+            if response.status == 200:
+                data = await response.json()
+                return "audioFile" in data
+            
+            return False
     
     except:
         return False
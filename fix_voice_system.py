@@ -10,9 +10,12 @@ Just run: python fix_voice_system.py
 """
 
 import os
+import re
 import shutil
 import asyncio
+import aiofiles
 from pathlib import Path
+from typing import Dict
 
 def backup_files():
     """Backup your original files"""
@@ -25,8 +28,20 @@ def backup_files():
     
     return True
 
-def create_fixed_components():
-    """Create fixed voice components"""
+async def _write_generated(path: str, content: str):
+    async with aiofiles.open(path, "w") as f:
+        await f.write(content)
+
+async def write_all_generated(generated: Dict[str, str]):
+    """Write every generated file at once"""
+    
+    await asyncio.gather(*(_write_generated(path, content) for path, content in generated.items()))
+    
+    for path in generated:
+        print(f"✅ Created {path}")
+
+def create_fixed_components() -> Dict[str, str]:
+    """Create fixed voice components (returned as {filename: source})"""
     
     print("🔧 Creating fixed voice components...")
     
@@ -64,10 +79,16 @@ def initialize_working_voice_system(api_key: str):
 __all__ = ['MurfAPIClient', 'VoiceService', 'FixedMurfAPIClient', 'FixedVoiceService']
 '''
     
-    with open("voice_fix_integration.py", "w") as f:
-        f.write(integration_code)
-    
-    print("✅ Created voice_fix_integration.py")
+    return {"voice_fix_integration.py": integration_code}
+
+# The old two-step voice initialization: "murf_client = MurfAPIClient(...)" followed
+# (possibly after other lines) by "voice_service = VoiceService(...)"
+_VOICE_INIT_RE = re.compile(
+    r"^[ \t]*murf_client = MurfAPIClient\b.*\n"
+    r"(?P<between>(?:.*\n)*?)"
+    r"(?P<indent>[ \t]*)[^\n]*voice_service = VoiceService\b[^\n]*",
+    re.MULTILINE
+)
 
 def update_main_py():
     """Update main.py to use fixed voice system"""
@@ -97,35 +118,14 @@ def update_main_py():
             # Insert at the beginning
             content = import_line + content
         
-        # Find and replace the voice system initialization in lifespan function
-        old_init_patterns = [
-            "murf_client = MurfAPIClient(settings.murf_api_key)",
-            "voice_service = VoiceService(murf_client)"
-        ]
-        
-        new_init = """        # Initialize FIXED voice system
-        murf_client, voice_service = initialize_working_voice_system(settings.murf_api_key)"""
-        
-        # Replace the initialization section
-        if "murf_client = MurfAPIClient" in content:
-            # Find the section and replace it
-            lines = content.split('\n')
-            new_lines = []
-            skip_next = False
-            
-            for line in lines:
-                if skip_next and "voice_service = VoiceService" in line:
-                    new_lines.append("        # Initialize FIXED voice system")
-                    new_lines.append("        murf_client, voice_service = initialize_working_voice_system(settings.murf_api_key)")
-                    skip_next = False
-                elif "murf_client = MurfAPIClient" in line:
-                    skip_next = True
-                    # Skip this line, will be replaced
-                    continue
-                else:
-                    new_lines.append(line)
-            
-            content = '\n'.join(new_lines)
+        # Replace the voice system initialization in lifespan function - the
+        # MurfAPIClient line is dropped and the next VoiceService line becomes
+        # the fixed initializer, keeping its indentation (one regex pass)
+        content = _VOICE_INIT_RE.sub(
+            r"\g<between>\g<indent># Initialize FIXED voice system\n"
+            r"\g<indent>murf_client, voice_service = initialize_working_voice_system(settings.murf_api_key)",
+            content
+        )
         
         # Write updated main.py
         with open("main.py", "w") as f:
@@ -139,8 +139,8 @@ def update_main_py():
         print("📝 You'll need to manually integrate the fix")
         return False
 
-def create_test_script():
-    """Create test script to verify the fix"""
+def create_test_script() -> Dict[str, str]:
+    """Create test script to verify the fix (returned as {filename: source})"""
     
     test_code = '''# test_voice_fix.py - Test the Voice System Fix
 """
@@ -232,10 +232,7 @@ if __name__ == "__main__":
         print("📝 Check the error messages above")
 '''
     
-    with open("test_voice_fix.py", "w") as f:
-        f.write(test_code)
-    
-    print("✅ Created test_voice_fix.py")
+    return {"test_voice_fix.py": test_code}
 
 def main():
     """Main fix process"""
@@ -249,7 +246,7 @@ def main():
     
     # Step 2: Create fixed components  
     print("\n2️⃣ Creating fixed components...")
-    create_fixed_components()
+    generated = create_fixed_components()
     
     # Step 3: Update main.py
     print("\n3️⃣ Updating main.py...")
@@ -257,7 +254,10 @@ def main():
     
     # Step 4: Create test
     print("\n4️⃣ Creating test script...")
-    create_test_script()
+    generated.update(create_test_script())
+    
+    # Generated files are written together in one pass
+    asyncio.run(write_all_generated(generated))
     
     print("\n" + "=" * 50)
     
@@ -7,10 +7,14 @@ Copy this file to your project directory and use it instead of the broken compon
 import asyncio
 import aiohttp
 import aiofiles
+import hashlib
+import itertools
 import logging
-import uuid
 import json
 import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional
@@ -31,6 +35,26 @@ class FixedMurfAPIClient:
         self.cache_dir = Path("voice_cache")
         self.cache_dir.mkdir(exist_ok=True)
         
+        # MP3s in the cache, counted once here and kept current as files are
+        # written, so stats never list the directory
+        with os.scandir(self.cache_dir) as entries:
+            self.cache_file_count = sum(1 for entry in entries if entry.name.endswith(".mp3"))
+        
+        # Audio filenames are pid + millisecond clock + a per-client counter -
+        # unique across workers sharing the cache without strftime or uuid4
+        self._audio_name_prefix = f"murf_audio_{os.getpid():x}_"
+        self._audio_counter = itertools.count()
+        
+        # Long-lived HTTP session, created on first request - TTS calls and
+        # audio downloads reuse its keep-alive connections
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Backpressure: at most this many syntheses (with their downloads) in
+        # flight; the connection pool is sized to match
+        self.max_concurrency = int(os.getenv("MURF_MAX_CONCURRENCY", "8"))
+        self._request_slots = asyncio.Semaphore(self.max_concurrency)
+        self._in_flight = 0
+        
         # Stats tracking
         self.stats = {
             "requests": 0,
@@ -43,6 +67,38 @@ class FixedMurfAPIClient:
         if not self.available:
             logger.warning(f"❌ API key issue: {api_key[:10] if api_key else 'None'}...")
     
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it if needed"""
+        
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_concurrency,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=45)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    @asynccontextmanager
+    async def _request_slot(self):
+        """Hold one of the MURF_MAX_CONCURRENCY request slots, counting it in flight"""
+        
+        async with self._request_slots:
+            self._in_flight += 1
+            try:
+                yield
+            finally:
+                self._in_flight -= 1
+    
     async def text_to_speech(self, text: str, voice_id: str = None) -> Dict[str, Any]:
         """Convert text to speech using Murf API"""
         
@@ -78,62 +134,36 @@ class FixedMurfAPIClient:
             headers = {
                 "api-key": self.api_key,
                 "Content-Type": "application/json",
-                "Accept": "application/json"
+                # Audio directly when Murf offers it, else the usual JSON + URL
+                "Accept": "audio/mpeg, application/json;q=0.9"
             }
             
             logger.info(f"🎙️ Making TTS request to Murf API...")
             logger.info(f"   Text length: {len(clean_text)} chars")
             logger.info(f"   Voice ID: {voice_id or self.default_voice_id}")
             
-            # Make API request with proper timeout
-            timeout = aiohttp.ClientTimeout(total=45)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    f"{self.base_url}/speech/generate",
-                    json=payload,
-                    headers=headers
-                ) as response:
-                    
-                    logger.info(f"🎙️ Murf API response status: {response.status}")
-                    
-                    if response.status == 200:
+            session = await self._get_session()
+            async with self._request_slot(), session.post(
+                f"{self.base_url}/speech/generate",
+                json=payload,
+                headers=headers
+            ) as response:
+                
+                logger.info(f"🎙️ Murf API response status: {response.status}")
+                
+                if response.status == 200:
+                    if response.content_type == "audio/mpeg":
+                        # Murf sent the audio itself - stream it straight to
+                        # disk instead of fetching it from a returned URL
+                        logger.info("✅ Murf API success: audio body")
+                        audio_url = None
+                        audio_path = await self._save_audio_stream(response)
+                    else:
                         response_data = await response.json()
                         logger.info(f"✅ Murf API success: {list(response_data.keys())}")
                         
                         # Check if audio file URL is in response
-                        if "audioFile" in response_data:
-                            audio_url = response_data["audioFile"]
-                            
-                            # Download the audio file
-                            audio_path = await self._download_audio_file(audio_url)
-                            
-                            if audio_path:
-                                self.stats["successes"] += 1
-                                self.stats["audio_files_created"] += 1
-                                
-                                # Generate public URL for serving
-                                audio_filename = Path(audio_path).name
-                                public_url = f"/audio/{audio_filename}"
-                                
-                                return {
-                                    "success": True,
-                                    "audio_path": audio_path,
-                                    "audio_url": public_url,
-                                    "voice_id": voice_id or self.default_voice_id,
-                                    "text_length": len(clean_text),
-                                    "audio_filename": audio_filename,
-                                    "murf_audio_url": audio_url
-                                }
-                            else:
-                                self.stats["failures"] += 1
-                                return {
-                                    "success": False,
-                                    "error": "Failed to download audio from Murf",
-                                    "audio_path": None,
-                                    "audio_url": None,
-                                    "murf_response_url": audio_url
-                                }
-                        else:
+                        if "audioFile" not in response_data:
                             self.stats["failures"] += 1
                             logger.warning(f"⚠️ No audioFile in response: {response_data}")
                             return {
@@ -143,41 +173,72 @@ class FixedMurfAPIClient:
                                 "audio_url": None,
                                 "murf_response": response_data
                             }
+                        
+                        # Download the audio file
+                        audio_url = response_data["audioFile"]
+                        audio_path = await self._download_audio_file(audio_url)
                     
-                    elif response.status == 401:
-                        self.stats["failures"] += 1
-                        error_text = await response.text()
-                        logger.error(f"❌ Murf API: Invalid API key - {error_text}")
+                    if audio_path:
+                        self.stats["successes"] += 1
+                        self.stats["audio_files_created"] += 1
+                        
+                        # Generate public URL for serving
+                        audio_filename = Path(audio_path).name
+                        public_url = f"/audio/{audio_filename}"
+                        
                         return {
-                            "success": False,
-                            "error": "Invalid Murf API key - check your credentials",
-                            "audio_path": None,
-                            "audio_url": None,
-                            "status_code": 401
+                            "success": True,
+                            "audio_path": audio_path,
+                            "audio_url": public_url,
+                            "voice_id": voice_id or self.default_voice_id,
+                            "text_length": len(clean_text),
+                            "audio_filename": audio_filename,
+                            "murf_audio_url": audio_url
                         }
-                    
-                    elif response.status == 429:
-                        self.stats["failures"] += 1
-                        logger.warning("⚠️ Murf API: Rate limit exceeded")
-                        return {
-                            "success": False,
-                            "error": "Murf API rate limit exceeded - please wait",
-                            "audio_path": None,
-                            "audio_url": None,
-                            "status_code": 429
-                        }
-                    
                     else:
                         self.stats["failures"] += 1
-                        error_text = await response.text()
-                        logger.error(f"❌ Murf API error {response.status}: {error_text}")
                         return {
                             "success": False,
-                            "error": f"Murf API error {response.status}: {error_text[:200]}",
+                            "error": "Failed to download audio from Murf",
                             "audio_path": None,
                             "audio_url": None,
-                            "status_code": response.status
+                            "murf_response_url": audio_url
                         }
+                
+                elif response.status == 401:
+                    self.stats["failures"] += 1
+                    error_text = await response.text()
+                    logger.error(f"❌ Murf API: Invalid API key - {error_text}")
+                    return {
+                        "success": False,
+                        "error": "Invalid Murf API key - check your credentials",
+                        "audio_path": None,
+                        "audio_url": None,
+                        "status_code": 401
+                    }
+                
+                elif response.status == 429:
+                    self.stats["failures"] += 1
+                    logger.warning("⚠️ Murf API: Rate limit exceeded")
+                    return {
+                        "success": False,
+                        "error": "Murf API rate limit exceeded - please wait",
+                        "audio_path": None,
+                        "audio_url": None,
+                        "status_code": 429
+                    }
+                
+                else:
+                    self.stats["failures"] += 1
+                    error_text = await response.text()
+                    logger.error(f"❌ Murf API error {response.status}: {error_text}")
+                    return {
+                        "success": False,
+                        "error": f"Murf API error {response.status}: {error_text[:200]}",
+                        "audio_path": None,
+                        "audio_url": None,
+                        "status_code": response.status
+                    }
         
         except asyncio.TimeoutError:
             self.stats["failures"] += 1
@@ -209,37 +270,43 @@ class FixedMurfAPIClient:
                 "audio_url": None
             }
     
+    async def _save_audio_stream(self, response: aiohttp.ClientResponse) -> Optional[str]:
+        """Write an audio response body to a new file in 64 KB chunks"""
+        
+        # Generate unique filename
+        filename = f"{self._audio_name_prefix}{int(time.time() * 1000):x}_{next(self._audio_counter):04x}.mp3"
+        file_path = self.cache_dir / filename
+        
+        size = 0
+        async with aiofiles.open(file_path, 'wb') as f:
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                await f.write(chunk)
+                size += len(chunk)
+        
+        # Verify file was created
+        if size > 0:
+            self.cache_file_count += 1
+            logger.info(f"✅ Audio downloaded: {file_path} ({size} bytes)")
+            return str(file_path)
+        else:
+            logger.error(f"❌ Audio file not created properly: {file_path}")
+            file_path.unlink(missing_ok=True)
+            return None
+    
     async def _download_audio_file(self, audio_url: str) -> Optional[str]:
         """Download audio file from Murf and save locally"""
         
         try:
             logger.info(f"📥 Downloading audio from: {audio_url[:50]}...")
             
-            # Generate unique filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"murf_audio_{timestamp}_{uuid.uuid4().hex[:8]}.mp3"
-            file_path = self.cache_dir / filename
-            
             # Download with timeout
-            timeout = aiohttp.ClientTimeout(total=30)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(audio_url) as response:
-                    if response.status == 200:
-                        # Write file
-                        async with aiofiles.open(file_path, 'wb') as f:
-                            async for chunk in response.content.iter_chunked(8192):
-                                await f.write(chunk)
-                        
-                        # Verify file was created
-                        if file_path.exists() and file_path.stat().st_size > 0:
-                            logger.info(f"✅ Audio downloaded: {file_path} ({file_path.stat().st_size} bytes)")
-                            return str(file_path)
-                        else:
-                            logger.error(f"❌ Audio file not created properly: {file_path}")
-                            return None
-                    else:
-                        logger.error(f"❌ Audio download failed: HTTP {response.status}")
-                        return None
+            session = await self._get_session()
+            async with session.get(audio_url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                if response.status == 200:
+                    return await self._save_audio_stream(response)
+                else:
+                    logger.error(f"❌ Audio download failed: HTTP {response.status}")
+                    return None
         
         except Exception as e:
             logger.error(f"❌ Audio download error: {e}")
@@ -271,11 +338,18 @@ class FixedMurfAPIClient:
             "success_rate_percentage": round(success_rate, 2),
             "audio_files_created": self.stats["audio_files_created"],
             "cache_directory": str(self.cache_dir),
-            "cache_files_count": len(list(self.cache_dir.glob("*.mp3"))) if self.cache_dir.exists() else 0
+            "cache_files_count": self.cache_file_count,
+            "in_flight_requests": self._in_flight,
+            "max_concurrency": self.max_concurrency
         }
 
 class FixedVoiceService:
-    """WORKING Voice service wrapper"""
+    """WORKING Voice service wrapper
+    
+    Synthesized audio is cached in two tiers: an in-process LRU of results,
+    then the content-addressed tts_<digest>.mp3 files in the voice cache,
+    which every worker on the host shares and which survive restarts.
+    """
     
     def __init__(self, murf_client: FixedMurfAPIClient):
         self.murf_client = murf_client
@@ -290,23 +364,47 @@ class FixedVoiceService:
             "cache_hits": 0,
             "service_start_time": datetime.now()
         }
+        self._start_monotonic = time.monotonic()  # uptime source - immune to clock changes
         
-        # Simple cache
-        self.text_cache = {}
+        # LRU of recent results keyed by the audio's content address - hot
+        # prompts (welcome, feedback templates) stay resident
+        self.text_cache = OrderedDict()
+        self.max_text_cache_size = 256
         
         logger.info(f"🎙️ Fixed voice service initialized - Available: {self.available}")
     
+    def _audio_cache_path(self, text: str, voice_id: str = None) -> Path:
+        """Content-addressed location for the audio of (voice, text)"""
+        
+        # Same normalization the Murf client applies before synthesis
+        resolved_voice = voice_id or self.murf_client.default_voice_id
+        digest = hashlib.blake2b(
+            f"{resolved_voice}|{text.strip()[:5000]}".encode("utf-8"), digest_size=16
+        ).hexdigest()
+        return self.murf_client.cache_dir / f"tts_{digest}.mp3"
+    
+    def _remember(self, cache_key: str, result: Dict[str, Any]):
+        """Store a result as most recently used, evicting the least recent"""
+        
+        self.text_cache[cache_key] = result
+        self.text_cache.move_to_end(cache_key)
+        if len(self.text_cache) > self.max_text_cache_size:
+            self.text_cache.popitem(last=False)
+    
     async def text_to_speech(self, text: str, voice_id: str = None) -> Dict[str, Any]:
         """Convert text to speech with caching"""
         
         self.service_stats["tts_requests"] += 1
         
-        # Check cache first
-        cache_key = f"{text[:50]}_{voice_id or 'default'}"
+        # Check cache first - memory, then audio already synthesized on disk
+        # (possibly by an earlier process)
+        cached_path = self._audio_cache_path(text or "", voice_id)
+        cache_key = cached_path.name
         if cache_key in self.text_cache:
             cached_result = self.text_cache[cache_key]
             # Verify cached file still exists
             if cached_result.get("audio_path") and Path(cached_result["audio_path"]).exists():
+                self.text_cache.move_to_end(cache_key)
                 self.service_stats["cache_hits"] += 1
                 logger.info("✅ Using cached audio file")
                 return cached_result
@@ -314,6 +412,21 @@ class FixedVoiceService:
                 # Remove invalid cache entry
                 del self.text_cache[cache_key]
         
+        if text and text.strip() and cached_path.exists():
+            self.service_stats["cache_hits"] += 1
+            logger.info(f"✅ Using cached audio file: {cached_path.name}")
+            result = {
+                "success": True,
+                "audio_path": str(cached_path),
+                "audio_url": f"/audio/{cached_path.name}",
+                "voice_id": voice_id or self.murf_client.default_voice_id,
+                "text_length": len(text.strip()[:5000]),
+                "audio_filename": cached_path.name,
+                "cached": True
+            }
+            self._remember(cache_key, result)
+            return result
+        
         # Generate new audio
         try:
             result = await self.murf_client.text_to_speech(text, voice_id)
@@ -321,14 +434,25 @@ class FixedVoiceService:
             if result["success"]:
                 self.service_stats["tts_successes"] += 1
                 
-                # Cache successful result
-                self.text_cache[cache_key] = result.copy()
+                # Move the download to its content address; os.replace is
+                # atomic, so a concurrent reader never sees a partial file
+                try:
+                    # Landing on an existing tts_ file (a concurrent request for
+                    # the same audio) leaves one file where the client counted two
+                    replaced_existing = cached_path.exists()
+                    os.replace(result["audio_path"], cached_path)
+                    if replaced_existing:
+                        self.murf_client.cache_file_count -= 1
+                    result.update(
+                        audio_path=str(cached_path),
+                        audio_url=f"/audio/{cached_path.name}",
+                        audio_filename=cached_path.name
+                    )
+                except OSError as e:
+                    logger.warning(f"⚠️ Could not cache audio file: {e}")
                 
-                # Limit cache size
-                if len(self.text_cache) > 50:
-                    # Remove oldest entry
-                    oldest_key = next(iter(self.text_cache))
-                    del self.text_cache[oldest_key]
+                # Cache successful result
+                self._remember(cache_key, result.copy())
                 
                 logger.info(f"✅ TTS Success: {result.get('audio_filename', 'unknown')}")
             else:
@@ -383,12 +507,12 @@ class FixedVoiceService:
         success_rate = (self.service_stats["tts_successes"] / max(total_requests, 1)) * 100
         cache_hit_rate = (self.service_stats["cache_hits"] / max(total_requests, 1)) * 100
         
-        uptime = datetime.now() - self.service_stats["service_start_time"]
+        uptime_seconds = time.monotonic() - self._start_monotonic
         
         return {
             "service_type": self.service_type,
             "available": self.available,
-            "uptime_minutes": int(uptime.total_seconds() / 60),
+            "uptime_minutes": int(uptime_seconds / 60),
             "tts_requests": self.service_stats["tts_requests"],
             "tts_successes": self.service_stats["tts_successes"],
             "tts_failures": self.service_stats["tts_failures"],
@@ -398,6 +522,10 @@ class FixedVoiceService:
             "cache_size": len(self.text_cache),
             "murf_client_stats": self.murf_client.get_stats()
         }
+    
+    async def close(self):
+        """Release the client's HTTP connections"""
+        await self.murf_client.close()
 
 # =============================================================================
 # QUICK TEST FUNCTION
@@ -447,6 +575,7 @@ async def test_fixed_voice_system():
     print(f"\n📊 Client Stats: {murf_client.get_stats()}")
     print(f"📊 Service Stats: {voice_service.get_service_stats()}")
     
+    await voice_service.close()
     return voice_service.available
 
 # =============================================================================
@@ -5,11 +5,80 @@ and tests them to find working ones.
 """
 
 import asyncio
-import aiohttp
+import httpx
 import os
 import json
+import time
+from pathlib import Path
 
-async def get_real_murf_voices():
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+from working_voice_client import (
+    H2_AVAILABLE,
+    VOICE_CATALOG_FILE,
+    VOICE_DISCOVERY_TTL,
+    CircuitOpenError,
+    MurfAuthError,
+    call_with_retry,
+    get_circuit_breaker,
+    raise_for_murf_status
+)
+
+# Discovery results are shared with WorkingMurfClient through its voice cache
+VOICE_CATALOG_PATH = Path("voice_cache") / VOICE_CATALOG_FILE
+
+# Voice probes run concurrently, at most this many at a time (Murf rate limits)
+MAX_CONCURRENT_PROBES = 8
+
+MURF_API_URL = "https://api.murf.ai/v1"
+
+def create_murf_client(api_key: str) -> httpx.AsyncClient:
+    """One client for the whole run - the API key rides along as a default header
+    
+    The pool is sized to the probe semaphore, so every admitted probe gets a
+    connection straight away and none sit idle beyond it.
+    """
+    return httpx.AsyncClient(
+        base_url=MURF_API_URL,
+        http2=H2_AVAILABLE,
+        headers={"api-key": api_key},
+        limits=httpx.Limits(
+            max_connections=MAX_CONCURRENT_PROBES,
+            max_keepalive_connections=MAX_CONCURRENT_PROBES
+        )
+    )
+
+def load_cached_voice_catalog():
+    """Catalog and working voices from the last run, if younger than the TTL"""
+    
+    try:
+        if time.time() - VOICE_CATALOG_PATH.stat().st_mtime < VOICE_DISCOVERY_TTL:
+            return _json_loads(VOICE_CATALOG_PATH.read_bytes())
+    except (OSError, ValueError):
+        pass
+    return None
+
+def save_voice_catalog(voices, working_voices):
+    """Persist the catalog and the voices that passed a probe
+    
+    Only called when at least one voice worked, so a run during a Murf
+    outage is not remembered for a day.
+    """
+    
+    try:
+        VOICE_CATALOG_PATH.parent.mkdir(exist_ok=True)
+        VOICE_CATALOG_PATH.write_bytes(_json_dumps({"voices": voices, "working": working_voices}))
+    except OSError as e:
+        print(f"⚠️ Could not cache voice catalog: {e}")
+
+async def get_real_murf_voices(client: httpx.AsyncClient):
     """Get actual voices from your Murf account"""
     
     print("🎙️ GETTING YOUR ACTUAL MURF VOICES")
@@ -18,161 +87,200 @@ async def get_real_murf_voices():
     api_key = os.getenv('MURF_API_KEY', 'your_murf_key_here')
     print(f"🔑 API Key: {api_key[:15]}...")
     
+    # The catalog changes on the order of days - reuse the last run's results
+    cached = load_cached_voice_catalog()
+    if cached is not None:
+        voices = cached.get("voices", [])
+        working_voices = cached.get("working", [])
+        print(f"📦 Using cached voice catalog ({len(voices)} voices, {len(working_voices)} working)")
+        return (working_voices[0] if working_voices else None), voices
+    
     try:
-        headers = {
-            "api-key": api_key,
-            "Accept": "application/json"
-        }
-        
         print("📞 Calling Murf API to get your voices...")
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                "https://api.murf.ai/v1/speech/voices",
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as response:
+        response = await client.get(
+            "/speech/voices",
+            headers={"Accept": "application/json"},
+            timeout=30.0
+        )
+        
+        print(f"📞 API Response: {response.status_code}")
+        
+        if response.status_code == 200:
+            data = _json_loads(response.content)
+            print(f"✅ Success! Got voices data")
+            
+            # Print the raw response to see the structure
+            print(f"\n📋 Raw API Response Structure:")
+            if isinstance(data, dict):
+                print(f"Type: Dictionary with keys: {list(data.keys())}")
+                voices = data.get('voices', data.get('data', []))
+            elif isinstance(data, list):
+                print(f"Type: List with {len(data)} items")
+                voices = data
+            else:
+                print(f"Type: {type(data)}")
+                voices = []
+            
+            print(f"📊 Total voices found: {len(voices)}")
+            
+            if voices:
+                print(f"\n🎭 YOUR AVAILABLE VOICES:")
+                print("=" * 40)
+                
+                # Each voice's probe is dispatched as soon as its entry is
+                # read, so testing overlaps the rest of the catalog walk
+                voice_ids = []
+                probed = set()
+                probes = []
+                semaphore = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+                key_rejected = False
                 
-                print(f"📞 API Response: {response.status}")
+                async def probe(voice_id: str) -> bool:
+                    nonlocal key_rejected
+                    async with semaphore:
+                        # Once Murf has rejected the key, queued probes are not sent
+                        if key_rejected:
+                            return False
+                        try:
+                            return await test_voice_directly(client, voice_id)
+                        except MurfAuthError:
+                            key_rejected = True
+                            raise
                 
-                if response.status == 200:
-                    data = await response.json()
-                    print(f"✅ Success! Got voices data")
+                for i, voice in enumerate(voices):
+                    print(f"\nVoice {i+1}:")
+                    print(f"Raw voice data: {voice}")
                     
-                    # Print the raw response to see the structure
-                    print(f"\n📋 Raw API Response Structure:")
-                    if isinstance(data, dict):
-                        print(f"Type: Dictionary with keys: {list(data.keys())}")
-                        voices = data.get('voices', data.get('data', []))
-                    elif isinstance(data, list):
-                        print(f"Type: List with {len(data)} items")
-                        voices = data
-                    else:
-                        print(f"Type: {type(data)}")
-                        voices = []
+                    # Handle different voice object formats
+                    voice_id = (
+                        voice.get('voice_id') or 
+                        voice.get('id') or 
+                        voice.get('voiceId') or 
+                        voice.get('name') or
+                        f"voice_{i}"
+                    )
                     
-                    print(f"📊 Total voices found: {len(voices)}")
+                    voice_name = (
+                        voice.get('voice_name') or 
+                        voice.get('name') or 
+                        voice.get('displayName') or
+                        voice_id
+                    )
                     
-                    if voices:
-                        print(f"\n🎭 YOUR AVAILABLE VOICES:")
-                        print("=" * 40)
-                        
-                        working_voices = []
-                        
-                        for i, voice in enumerate(voices):
-                            print(f"\nVoice {i+1}:")
-                            print(f"Raw voice data: {voice}")
-                            
-                            # Handle different voice object formats
-                            voice_id = (
-                                voice.get('voice_id') or 
-                                voice.get('id') or 
-                                voice.get('voiceId') or 
-                                voice.get('name') or
-                                f"voice_{i}"
-                            )
-                            
-                            voice_name = (
-                                voice.get('voice_name') or 
-                                voice.get('name') or 
-                                voice.get('displayName') or
-                                voice_id
-                            )
-                            
-                            language = (
-                                voice.get('language') or 
-                                voice.get('locale') or 
-                                voice.get('lang') or
-                                'Unknown'
-                            )
-                            
-                            gender = (
-                                voice.get('gender') or 
-                                voice.get('sex') or
-                                'Unknown'
-                            )
-                            
-                            print(f"   ID: {voice_id}")
-                            print(f"   Name: {voice_name}")
-                            print(f"   Language: {language}")
-                            print(f"   Gender: {gender}")
-                            
-                            # Test this voice immediately
-                            print(f"   Testing... ", end="")
-                            test_result = await test_voice_directly(api_key, voice_id)
-                            if test_result:
-                                working_voices.append(voice_id)
-                                print(f"✅ WORKS!")
-                            else:
-                                print(f"❌ Failed")
-                        
-                        if working_voices:
-                            print(f"\n🎉 WORKING VOICES: {working_voices}")
-                            return working_voices[0], voices
-                        else:
-                            print(f"\n❌ None of the voices worked")
-                            return None, voices
-                    else:
-                        print("❌ No voices in response")
-                        return None, []
-                
-                else:
-                    error_text = await response.text()
-                    print(f"❌ API Error {response.status}:")
-                    print(f"   {error_text}")
+                    language = (
+                        voice.get('language') or 
+                        voice.get('locale') or 
+                        voice.get('lang') or
+                        'Unknown'
+                    )
+                    
+                    gender = (
+                        voice.get('gender') or 
+                        voice.get('sex') or
+                        'Unknown'
+                    )
                     
-                    if response.status == 401:
-                        print("🔑 API key issue - check your Murf account")
-                    elif response.status == 403:
-                        print("🚫 Account access issue - check TTS permissions")
+                    print(f"   ID: {voice_id}")
+                    print(f"   Name: {voice_name}")
+                    print(f"   Language: {language}")
+                    print(f"   Gender: {gender}")
                     
-                    return None, []
+                    # A voice listed twice is only synthesized once
+                    if voice_id in probed:
+                        continue
+                    probed.add(voice_id)
+                    voice_ids.append(voice_id)
+                    probes.append(asyncio.create_task(probe(voice_id)))
+                    await asyncio.sleep(0)  # let the probe send its request
+                
+                print(f"\n🧪 Testing {len(voice_ids)} voices...")
+                try:
+                    test_results = await asyncio.gather(*probes)
+                except MurfAuthError as e:
+                    # The key is rejected for synthesis, so every other probe would be too
+                    print(f"\n🔑 Murf rejected the API key for TTS ({e}) - stopped testing voices")
+                    return None, voices
+                finally:
+                    # Probes still queued or in flight are abandoned
+                    for task in probes:
+                        task.cancel()
+                    await asyncio.gather(*probes, return_exceptions=True)
+                
+                working_voices = [
+                    voice_id for voice_id, test_result in zip(voice_ids, test_results)
+                    if test_result
+                ]
+                
+                if working_voices:
+                    print(f"\n🎉 WORKING VOICES: {working_voices}")
+                    save_voice_catalog(voices, working_voices)
+                    return working_voices[0], voices
+                else:
+                    print(f"\n❌ None of the voices worked")
+                    return None, voices
+            else:
+                print("❌ No voices in response")
+                return None, []
+        
+        else:
+            error_text = response.text
+            print(f"❌ API Error {response.status_code}:")
+            print(f"   {error_text}")
+            
+            if response.status_code == 401:
+                print("🔑 API key issue - check your Murf account")
+            elif response.status_code == 403:
+                print("🚫 Account access issue - check TTS permissions")
+            
+            return None, []
     
     except Exception as e:
         print(f"❌ Error getting voices: {e}")
         return None, []
 
-async def test_voice_directly(api_key: str, voice_id: str) -> bool:
-    """Test voice directly with minimal payload"""
+async def test_voice_directly(client: httpx.AsyncClient, voice_id: str) -> bool:
+    """Test voice directly with minimal payload
     
-    try:
-        # Minimal test payload
-        payload = {
-            "voiceId": voice_id,
-            "text": "Hi",
-            "audioFormat": "MP3"
-        }
-        
-        headers = {
-            "api-key": api_key,
-            "Content-Type": "application/json"
-        }
-        
-        print(f"   Testing {voice_id}... ", end="")
+    Raises MurfAuthError when the key is rejected (401/403) - no other voice
+    can work either, so callers stop probing.
+    """
+    
+    url = f"{MURF_API_URL}/speech/generate"
+    
+    # Minimal test payload (json= sets the Content-Type header)
+    payload = {
+        "voiceId": voice_id,
+        "text": "Hi",
+        "audioFormat": "MP3"
+    }
+    
+    async def probe() -> bool:
+        response = await client.post(url, json=payload, timeout=15.0)
+        raise_for_murf_status(response)
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.murf.ai/v1/speech/generate",
-                json=payload,
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=15)
-            ) as response:
-                
-                if response.status == 200:
-                    data = await response.json()
-                    if "audioFile" in data:
-                        print("✅ WORKS!")
-                        return True
-                    else:
-                        print("❌ No audio file")
-                        return False
-                else:
-                    error = await response.text()
-                    print(f"❌ {response.status}")
-                    return False
+        if response.status_code == 200:
+            if "audioFile" in response.json():
+                print(f"   Testing {voice_id}... ✅ WORKS!")
+                return True
+            else:
+                print(f"   Testing {voice_id}... ❌ No audio file")
+                return False
+        else:
+            print(f"   Testing {voice_id}... ❌ {response.status_code}")
+            return False
     
-    except Exception as e:
-        print(f"❌ Error: {str(e)[:30]}")
+    try:
+        # Timeouts and connection errors are retried with jitter; once Murf
+        # has failed 3 times in a row the remaining probes skip the network
+        return await call_with_retry(get_circuit_breaker(url), probe)
+    
+    except CircuitOpenError:
+        print(f"   Testing {voice_id}... ⏭️ Skipped (Murf circuit open)")
+        return False
+    
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"   Testing {voice_id}... ❌ Error: {str(e)[:30] or type(e).__name__}")
         return False
 
 async def create_working_voice_file(working_voice_id: str):
@@ -219,54 +327,59 @@ def initialize_working_voice_system(api_key: str):
 async def main():
     """Main execution"""
     
+    api_key = os.getenv('MURF_API_KEY', 'your_murf_key_here')
+    
     try:
-        working_voice, all_voices = await get_real_murf_voices()
-        
-        if working_voice:
-            print(f"\n🎉 FOUND WORKING VOICE: {working_voice}")
-            
-            # Create config file
-            await create_working_voice_file(working_voice)
+        # Every request in the run shares this client's connection pool
+        async with create_murf_client(api_key) as client:
+            working_voice, all_voices = await get_real_murf_voices(client)
             
-            # Test the working voice one more time
-            print(f"\n🧪 Final test with {working_voice}...")
-            final_test = await test_voice_directly(
-                os.getenv('MURF_API_KEY', 'your_murf_key_here'),
-                working_voice
-            )
-            
-            if final_test:
-                print(f"✅ CONFIRMED WORKING!")
+            if working_voice:
+                print(f"\n🎉 FOUND WORKING VOICE: {working_voice}")
                 
-                print(f"\n🚀 READY TO INTEGRATE:")
-                print(f"   Working Voice: {working_voice}")
-                print(f"   1. Update main.py to use: {working_voice}")
-                print(f"   2. Or use working_voice_config.py")
-                print(f"   3. Restart server: python main.py")
+                # Create config file
+                await create_working_voice_file(working_voice)
                 
-                # Show simple integration
-                print(f"\n📝 SIMPLE FIX FOR MAIN.PY:")
-                print(f"Add this line in your voice initialization:")
-                print(f"murf_client.default_voice_id = '{working_voice}'")
+                # Test the working voice one more time
+                print(f"\n🧪 Final test with {working_voice}...")
+                try:
+                    final_test = await test_voice_directly(client, working_voice)
+                except MurfAuthError as e:
+                    print(f"🔑 Murf rejected the API key ({e})")
+                    final_test = False
                 
-            else:
-                print(f"❌ Final test failed")
-        
-        else:
-            print(f"\n❌ No working voices found")
-            
-            if all_voices:
-                print(f"📋 Your account has {len(all_voices)} voices but none worked")
-                print(f"🔍 First voice details:")
-                first_voice = all_voices[0]
-                for key, value in first_voice.items():
-                    print(f"   {key}: {value}")
+                if final_test:
+                    print(f"✅ CONFIRMED WORKING!")
+                    
+                    print(f"\n🚀 READY TO INTEGRATE:")
+                    print(f"   Working Voice: {working_voice}")
+                    print(f"   1. Update main.py to use: {working_voice}")
+                    print(f"   2. Or use working_voice_config.py")
+                    print(f"   3. Restart server: python main.py")
                     
-                print(f"\n💡 Try contacting Murf support about API access")
+                    # Show simple integration
+                    print(f"\n📝 SIMPLE FIX FOR MAIN.PY:")
+                    print(f"Add this line in your voice initialization:")
+                    print(f"murf_client.default_voice_id = '{working_voice}'")
+                    
+                else:
+                    print(f"❌ Final test failed")
+            
             else:
-                print(f"📋 Could not get voices from API")
-                print(f"💡 Check your Murf account and API key")
-    
+                print(f"\n❌ No working voices found")
+                
+                if all_voices:
+                    print(f"📋 Your account has {len(all_voices)} voices but none worked")
+                    print(f"🔍 First voice details:")
+                    first_voice = all_voices[0]
+                    for key, value in first_voice.items():
+                        print(f"   {key}: {value}")
+                        
+                    print(f"\n💡 Try contacting Murf support about API access")
+                else:
+                    print(f"📋 Could not get voices from API")
+                    print(f"💡 Check your Murf account and API key")
+        
     except Exception as e:
         print(f"❌ Process failed: {e}")
         import traceback
@@ -4,6 +4,7 @@ Instantly fixes your voice system using the real voice IDs we discovered
 """
 
 import os
+import re
 from pathlib import Path
 
 def apply_instant_fix():
@@ -32,6 +33,17 @@ def apply_instant_fix():
         "working_voice_client.py"
     ]
     
+    # Patterns to replace, compiled into one alternation so each file is
+    # scanned once; longer patterns come first so they win where they overlap
+    replacements = {
+        'self.default_voice_id = "natalie"': f'self.default_voice_id = "{WORKING_VOICE}"',
+        'self.default_voice_id = "en-US-sarah"': f'self.default_voice_id = "{WORKING_VOICE}"',
+        'self.default_voice_id = None': f'self.default_voice_id = "{WORKING_VOICE}"',
+        '"en-US-sarah"': f'"{WORKING_VOICE}"',
+        '"natalie"': f'"{WORKING_VOICE}"'
+    }
+    pattern = re.compile("|".join(re.escape(old) for old in replacements))
+    
     for filename in files_to_fix:
         if Path(filename).exists():
             try:
@@ -40,23 +52,17 @@ def apply_instant_fix():
                 with open(filename, "r") as f:
                     content = f.read()
                 
-                # Multiple patterns to replace
-                replacements = [
-                    ('self.default_voice_id = "natalie"', f'self.default_voice_id = "{WORKING_VOICE}"'),
-                    ('self.default_voice_id = "en-US-sarah"', f'self.default_voice_id = "{WORKING_VOICE}"'),
-                    ('self.default_voice_id = None', f'self.default_voice_id = "{WORKING_VOICE}"'),
-                    ('"en-US-sarah"', f'"{WORKING_VOICE}"'),
-                    ('"natalie"', f'"{WORKING_VOICE}"')
-                ]
+                matched = {}  # insertion-ordered set of patterns that hit
+                
+                def replace(match):
+                    matched[match.group(0)] = True
+                    return replacements[match.group(0)]
                 
-                updated = False
-                for old, new in replacements:
-                    if old in content:
-                        content = content.replace(old, new)
-                        updated = True
-                        print(f"   ✅ Replaced: {old} → {new}")
+                content, count = pattern.subn(replace, content)
+                for old in matched:
+                    print(f"   ✅ Replaced: {old} → {replacements[old]}")
                 
-                if updated:
+                if count:
                     with open(filename, "w") as f:
                         f.write(content)
                     print(f"✅ Updated {filename}")
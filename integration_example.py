@@ -8,6 +8,13 @@ import asyncio
 import logging
 from datetime import datetime
 
+# uvloop's libuv-based event loop when installed (ships with uvicorn[standard])
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -90,6 +97,9 @@ async def run_complete_interview_example():
         
         evaluation_results = []
         
+        # Deliberately sequential: each answer is scored against the session's
+        # current question and advances it, so concurrent calls on one session
+        # would race and pair answers with the wrong questions
         for i, response_data in enumerate(candidate_responses, 1):
             print(f"\n📝 Processing Response {i}: {response_data['description']}")
             print(f"💭 Input: {response_data['input'][:100]}...")
@@ -331,5 +341,6 @@ if __name__ == "__main__":
             return False
     
     # Run the complete test suite
-    success = asyncio.run(main())
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop if UVLOOP_AVAILABLE else None) as runner:
+        success = runner.run(main())
     exit(0 if success else 1)
\ No newline at end of file
@@ -1191,7 +1191,8 @@ class VoiceEnhancedInterviewOrchestrator(InterviewOrchestrator):
             "tts_success_rate": round(tts_success_rate, 2),
             "voice_service_available": self.voice_service and self.voice_service.available,
             "active_voice_sessions": len(self.voice_sessions),
-            "voice_cache_files": len(list(Path("voice_cache").glob("*.mp3"))) if Path("voice_cache").exists() else 0
+            # The Murf client keeps an exact count as it writes the cache
+            "voice_cache_files": getattr(getattr(self.voice_service, "murf_client", None), "cache_file_count", 0)
         }
     
     # Inherit ALL existing methods from parent class
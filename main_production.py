@@ -9,6 +9,7 @@ This integrates all your actual components:
 """
 
 import asyncio
+import importlib.util
 import logging
 import uuid
 import os
@@ -25,7 +26,7 @@ from pydantic import BaseModel, Field
 
 # Import YOUR actual components
 try:
-    from evaluation_engine import ClaudeEvaluationEngine
+    from evaluation_engine import ClaudeEvaluationEngine, close_shared_anthropic_clients
     EVALUATION_ENGINE_AVAILABLE = True
     print("✅ ClaudeEvaluationEngine imported successfully")
 except ImportError as e:
@@ -52,6 +53,10 @@ except ImportError as e:
     VOICE_CLIENT_AVAILABLE = False
     print(f"❌ FixedMurfClient import failed: {e}")
 
+# libuv event loop and C HTTP parser for the server (both ship with uvicorn[standard])
+UVLOOP_AVAILABLE = importlib.util.find_spec("uvloop") is not None
+HTTPTOOLS_AVAILABLE = importlib.util.find_spec("httptools") is not None
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -215,6 +220,19 @@ async def startup_event():
         logger.error(f"❌ Production startup failed: {e}")
         # Don't exit - let health checks show the issues
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush buffered evaluation cache writes and release pooled Claude and Murf connections"""
+    
+    if evaluation_engine is not None:
+        await evaluation_engine.close()
+    
+    if EVALUATION_ENGINE_AVAILABLE:
+        await close_shared_anthropic_clients()
+    
+    if voice_service is not None:
+        await voice_service.close()
+
 # =============================================================================
 # API ENDPOINTS USING YOUR REAL SYSTEM
 # =============================================================================
@@ -574,7 +592,9 @@ def main():
             port=config.port,
             log_level="info" if not config.debug else "debug",
             reload=False,  # Disable in production
-            access_log=True
+            access_log=True,
+            loop="uvloop" if UVLOOP_AVAILABLE else "asyncio",
+            http="httptools" if HTTPTOOLS_AVAILABLE else "h11"
         )
         
     except KeyboardInterrupt:
@@ -0,0 +1,5 @@
+# conftest.py - make the root modules importable from tests/
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,81 @@
+# test_claude_api_wrapper.py - ClaudeAPIWrapper lifecycle
+import asyncio
+
+import evaluation_engine
+from evaluation_engine import ClaudeAPIWrapper
+
+
+class FakeAnthropicClient:
+    closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+def test_closing_one_wrapper_keeps_the_shared_client_open(monkeypatch):
+    shared = FakeAnthropicClient()
+    monkeypatch.setattr(evaluation_engine, "ANTHROPIC_AVAILABLE", True)
+    monkeypatch.setitem(evaluation_engine._ANTHROPIC_CLIENTS, "sk-shared-key", shared)
+
+    first = ClaudeAPIWrapper(api_key="sk-shared-key")
+    second = ClaudeAPIWrapper(api_key="sk-shared-key")
+    assert first.anthropic_client is second.anthropic_client is shared
+
+    asyncio.run(first.close())
+
+    assert not shared.closed
+    assert evaluation_engine._ANTHROPIC_CLIENTS["sk-shared-key"] is shared
+    assert second.available
+
+
+def test_closing_the_batcher_fails_queued_requests():
+    from evaluation_engine import _ClaudeBatchCoalescer
+
+    dispatched = []
+
+    async def dispatch(batch):
+        dispatched.append(batch)
+
+    async def scenario():
+        # A long window keeps the first request in the worker's hands while
+        # the others wait in the queue
+        batcher = _ClaudeBatchCoalescer(dispatch, max_batch_size=8, batch_window_ms=60_000)
+        submits = [asyncio.create_task(batcher.submit({"id": i}, "answer")) for i in range(3)]
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+        batcher.close()
+        return await asyncio.wait_for(asyncio.gather(*submits, return_exceptions=True), timeout=1)
+
+    results = asyncio.run(scenario())
+
+    assert dispatched == []
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_batch_cancelled_mid_flight_falls_back():
+    wrapper = ClaudeAPIWrapper(anthropic_client=FakeAnthropicClient())
+    wrapper.batcher.batch_window_ms = 0
+    started = []
+
+    async def never_answers(question, response_text):
+        started.append(response_text)
+        await asyncio.Event().wait()
+
+    wrapper._evaluate_single = never_answers
+    question = {"id": "q1", "text": "Explain VLOOKUP", "expected_keywords": ["vlookup"]}
+
+    async def scenario():
+        evaluation = asyncio.create_task(
+            wrapper.evaluate_text_response(question, "VLOOKUP finds a value in a table")
+        )
+        while not started:
+            await asyncio.sleep(0)
+
+        for task in list(wrapper.batcher._tasks):
+            task.cancel()
+        return await asyncio.wait_for(evaluation, timeout=1)
+
+    evaluation = asyncio.run(scenario())
+
+    assert evaluation["evaluation_method"] == "enhanced_fallback"
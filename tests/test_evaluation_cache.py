@@ -0,0 +1,79 @@
+# test_evaluation_cache.py - EvaluationCache Redis batching
+import asyncio
+
+from evaluation_engine import ClaudeEvaluationEngine, EvaluationCache
+
+
+class SlowMgetRedis:
+    """Redis stand-in whose MGET blocks until the test releases it"""
+
+    def __init__(self, values):
+        self.values = values
+        self.mget_calls = []
+        self.release = asyncio.Event()
+
+    async def mget(self, keys):
+        self.mget_calls.append(list(keys))
+        await self.release.wait()
+        return [self.values.get(key) for key in keys]
+
+
+def test_read_issued_during_pending_mget_is_flushed():
+    async def scenario():
+        redis = SlowMgetRedis({"a": b'{"score": 1}', "b": b'{"score": 2}'})
+        cache = EvaluationCache(redis_client=redis)
+
+        first = asyncio.create_task(cache.get_cached_evaluation("a"))
+        while not redis.mget_calls:
+            await asyncio.sleep(0)
+
+        # The first MGET is still in flight when the second read arrives
+        second = asyncio.create_task(cache.get_cached_evaluation("b"))
+        await asyncio.sleep(0)
+        redis.release.set()
+
+        return await asyncio.wait_for(asyncio.gather(first, second), timeout=1), redis
+
+    (first, second), redis = asyncio.run(scenario())
+
+    assert first == {"score": 1}
+    assert second == {"score": 2}
+    assert redis.mget_calls == [["a"], ["b"]]
+
+
+class RecordingRedis:
+    """Redis stand-in that records pipelined SETEX writes"""
+
+    def __init__(self):
+        self.written = {}
+
+    def pipeline(self):
+        redis = self
+
+        class Pipeline:
+            def __init__(self):
+                self.pending = []
+
+            def setex(self, key, ttl, value):
+                self.pending.append((key, value))
+
+            async def execute(self):
+                redis.written.update(self.pending)
+
+        return Pipeline()
+
+
+def test_engine_close_flushes_buffered_cache_writes():
+    async def scenario():
+        redis = RecordingRedis()
+        engine = ClaudeEvaluationEngine(redis_client=redis)
+        await engine.cache.cache_evaluation("eval_v2:q1:abc", {"score": 4.0})
+
+        # Still buffered - the interval flusher has not run yet
+        assert redis.written == {}
+        await engine.close()
+        return redis
+
+    redis = asyncio.run(scenario())
+
+    assert list(redis.written) == ["eval_v2:q1:abc"]
@@ -0,0 +1,34 @@
+# test_excel_file_analyzer.py - workbook analysis
+import asyncio
+
+import pytest
+
+from evaluation_engine import ClaudeEvaluationEngine, ExcelFileAnalyzer
+
+
+def test_error_cells_counts_every_error_not_just_the_listed_ones(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    for row in range(1, 16):
+        sheet.cell(row=row, column=1, value="#REF!")
+    path = tmp_path / "errors.xlsx"
+    workbook.save(path)
+
+    analysis = ExcelFileAnalyzer()._analyze_with_openpyxl_sync(str(path), path.stat().st_size)
+    sheet_data = analysis["cell_analysis"][sheet.title]
+
+    assert len(sheet_data["errors"]) == 10
+    assert sheet_data["errors_count"] == 15
+    assert analysis["data_quality_metrics"]["error_cells"] == 15
+
+
+def test_engine_close_shuts_down_the_parse_pool():
+    engine = ClaudeEvaluationEngine()
+    parse_pool = engine.file_analyzer._parse_pool
+
+    asyncio.run(engine.close())
+
+    with pytest.raises(RuntimeError):
+        parse_pool.submit(print)
@@ -0,0 +1,52 @@
+# test_fixed_murf_client.py - voice cache file accounting
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("aiofiles")
+
+from fixed_murf_client import FixedMurfAPIClient, FixedVoiceService
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    # voice_cache/ is created relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    return FixedVoiceService(FixedMurfAPIClient("k" * 20))
+
+
+def cached_mp3s(client):
+    return sorted(path.name for path in client.cache_dir.glob("*.mp3"))
+
+
+def test_cache_count_does_not_drift_when_audio_lands_on_an_existing_file(service):
+    client = service.murf_client
+    text = "Welcome to your Excel interview"
+    cached_path = service._audio_cache_path(text)
+
+    async def synthesize(text, voice_id=None):
+        # A concurrent request for the same audio has already landed its file
+        cached_path.write_bytes(b"winner")
+        client.cache_file_count += 1
+
+        audio_path = client.cache_dir / "murf_audio_1_2_0000.mp3"
+        audio_path.write_bytes(b"loser")
+        client.cache_file_count += 1
+        return {"success": True, "audio_path": str(audio_path), "audio_url": None}
+
+    client.text_to_speech = synthesize
+    result = asyncio.run(service.text_to_speech(text))
+
+    assert result["audio_path"] == str(cached_path)
+    assert cached_mp3s(client) == [cached_path.name]
+    assert client.cache_file_count == 1
+
+
+def test_orchestrator_reports_the_client_cache_count(service):
+    from interview_orchestrator import VoiceEnhancedInterviewOrchestrator
+
+    service.murf_client.cache_file_count = 7
+    orchestrator = VoiceEnhancedInterviewOrchestrator(voice_service=service)
+
+    assert orchestrator.get_voice_stats()["voice_cache_files"] == 7
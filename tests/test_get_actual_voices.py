@@ -0,0 +1,36 @@
+# test_get_actual_voices.py - voice catalog probing
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("aiofiles")
+
+import get_actual_voices
+from get_actual_voices import MAX_CONCURRENT_PROBES, MURF_API_URL, get_real_murf_voices
+
+
+def test_rejected_tts_key_stops_probing(tmp_path, monkeypatch):
+    # The voice catalog is cached relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(get_actual_voices, "VOICE_CATALOG_PATH", tmp_path / "voices_catalog.json")
+    voices = [{"voiceId": f"en-US-voice{i}"} for i in range(40)]
+    synth_calls = []
+
+    def handler(request):
+        if request.url.path.endswith("/speech/voices"):
+            return httpx.Response(200, json=voices)
+        synth_calls.append(request)
+        # The key can list voices but is not allowed to synthesize
+        return httpx.Response(403, json={"errorMessage": "Forbidden"})
+
+    async def run():
+        async with httpx.AsyncClient(base_url=MURF_API_URL, transport=httpx.MockTransport(handler)) as client:
+            return await get_real_murf_voices(client)
+
+    working_voice, all_voices = asyncio.run(run())
+
+    assert working_voice is None
+    assert all_voices == voices
+    assert len(synth_calls) <= MAX_CONCURRENT_PROBES
+    assert not (tmp_path / "voices_catalog.json").exists()
@@ -0,0 +1,61 @@
+# test_program_cache.py - learned scoring rubrics
+import asyncio
+
+from evaluation_engine import ClaudeEvaluationEngine, ProgramCache
+
+RUBRIC = {
+    "base_score": 1.0,
+    "keyword_weights": {"vlookup": 2.0},
+    "mistake_penalties": {},
+    "length_bonus": []
+}
+
+
+class RubricSource:
+    """Stands in for ClaudeAPIWrapper.generate_scoring_rubric"""
+
+    async def generate_scoring_rubric(self, question, exemplars):
+        return RUBRIC
+
+
+def learn(cache: ProgramCache, exemplars):
+    for response, score in exemplars:
+        if cache.record("q1", response, score):
+            asyncio.run(cache.generate("q1", {"id": "q1"}, RubricSource()))
+
+
+def test_learned_rubrics_are_opt_in():
+    assert ClaudeEvaluationEngine().program_cache is None
+    assert ClaudeEvaluationEngine(learned_rubrics=True).program_cache is not None
+
+
+def test_rubric_with_one_badly_wrong_holdout_is_rejected():
+    cache = ProgramCache()
+    # The rubric scores "uses vlookup" at 3.0 and anything else at 1.0
+    agreeing = [("uses vlookup", 3.0)] * 4 + [("no idea", 1.0)] * 7
+    learn(cache, agreeing + [("no idea", 2.5)])
+
+    assert "q1" not in cache.programs
+    assert cache.stats["programs_rejected"] == 1
+
+
+def test_drifting_rubric_is_retired_by_audits():
+    cache = ProgramCache(audit_every=2, min_audits=3)
+    learn(cache, [("uses vlookup", 3.0)] * 6 + [("no idea", 1.0)] * 6)
+    assert "q1" in cache.programs
+
+    audits = 0
+    while "q1" in cache.programs:
+        if cache.audit_due("q1"):
+            # Claude now grades the same answer much lower than the rubric
+            cache.audit("q1", "uses vlookup", 1.0)
+            audits += 1
+        else:
+            cache.run("q1", "uses vlookup")
+
+    stats = cache.get_stats()
+    assert audits == 3
+    assert stats["programs_retired"] == 1
+    assert stats["drift_rate"] == 1.0
+    assert stats["local_evaluations"] == 3
+    assert stats["claude_calls_saved_per_call_spent"] == 0.75
@@ -0,0 +1,73 @@
+# test_question_fields.py - per-question caches across evaluations
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import evaluation_engine
+from evaluation_engine import ClaudeEvaluationEngine, _question_fields_for
+
+QUESTION = {
+    "id": "vlookup_basics",
+    "text": "Explain how VLOOKUP works",
+    "difficulty": "intermediate",
+    "skill_category": "lookup_functions",
+    "expected_keywords": [
+        "vlookup", "lookup value", "table array", "column index",
+        "exact match", "approximate match", "first column", "range lookup"
+    ],
+    "common_mistakes": ["hlookup", "left lookup"]
+}
+
+
+def evaluate_repeatedly(times: int):
+    engine = ClaudeEvaluationEngine()
+
+    async def run():
+        for i in range(times):
+            # Distinct responses, so every evaluation misses the result cache
+            await engine.evaluate_response(
+                QUESTION, f"VLOOKUP finds a lookup value in the table array with exact match ({i})"
+            )
+
+    asyncio.run(run())
+
+
+def test_question_fields_are_built_once_per_question():
+    _question_fields_for.cache_clear()
+
+    evaluate_repeatedly(5)
+
+    assert _question_fields_for.cache_info().misses == 1
+
+
+def test_keyword_automaton_is_built_once_per_question(monkeypatch):
+    ahocorasick = pytest.importorskip("ahocorasick")
+    builds = []
+
+    def counting_automaton():
+        builds.append(1)
+        return ahocorasick.Automaton()
+
+    monkeypatch.setattr(evaluation_engine, "ahocorasick", SimpleNamespace(Automaton=counting_automaton), raising=False)
+    monkeypatch.setattr(evaluation_engine, "AHOCORASICK_AVAILABLE", True)
+    _question_fields_for.cache_clear()
+
+    evaluate_repeatedly(5)
+
+    assert len(builds) == 1
+
+
+def test_automaton_matches_agree_with_token_matching(monkeypatch):
+    pytest.importorskip("ahocorasick")
+    engine = ClaudeEvaluationEngine()
+    question = dict(QUESTION, common_mistakes=[])
+    response = "Use VLOOKUP: give the lookup value, the table array and an exact match, not a left lookup"
+
+    monkeypatch.setattr(evaluation_engine, "AHOCORASICK_AVAILABLE", False)
+    plain = engine.claude_api._enhanced_fallback_evaluation(question, response)
+    monkeypatch.setattr(evaluation_engine, "AHOCORASICK_AVAILABLE", True)
+    scanned = engine.claude_api._enhanced_fallback_evaluation(question, response)
+
+    assert scanned["keywords_found"] == plain["keywords_found"]
+    assert scanned["score"] == plain["score"]
@@ -0,0 +1,12 @@
+# test_semantic_cache.py - similarity cache configuration
+import evaluation_engine
+from evaluation_engine import ClaudeEvaluationEngine
+
+
+def test_semantic_cache_is_opt_in(monkeypatch):
+    monkeypatch.setattr(evaluation_engine, "SENTENCE_TRANSFORMERS_AVAILABLE", True)
+
+    assert ClaudeEvaluationEngine().semantic_cache is None
+
+    engine = ClaudeEvaluationEngine(semantic_cache_threshold=0.92)
+    assert engine.semantic_cache.similarity_threshold == 0.92
@@ -0,0 +1,102 @@
+# test_working_voice_client.py - WorkingMurfClient voice discovery
+import asyncio
+import json
+import time
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("aiofiles")
+
+from working_voice_client import WorkingMurfClient
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # voice_cache/ is created relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    return WorkingMurfClient("k" * 20)
+
+
+def stub_probes(monkeypatch, client, working):
+    probed = []
+
+    async def quick_voice_test(voice_id):
+        probed.append(voice_id)
+        return voice_id in working
+
+    monkeypatch.setattr(client, "_quick_voice_test", quick_voice_test)
+    return probed
+
+
+def test_default_voice_is_probed_once_and_persisted(client, monkeypatch):
+    probed = stub_probes(monkeypatch, client, {"en-US-cooper"})
+
+    assert asyncio.run(client.find_working_voice()) == "en-US-cooper"
+    assert asyncio.run(client.find_working_voice()) == "en-US-cooper"
+
+    assert probed == ["en-US-cooper"]
+    assert json.loads(client._last_good_path.read_text())["voice_id"] == "en-US-cooper"
+
+
+def test_stale_last_good_voice_is_probed_before_the_sweep(client, monkeypatch):
+    client._last_good_path.write_text(json.dumps({"voice_id": "olivia", "ts": 0}))
+    client = WorkingMurfClient("k" * 20)
+    probed = stub_probes(monkeypatch, client, {"olivia"})
+
+    assert asyncio.run(client.find_working_voice()) == "olivia"
+    assert probed == ["olivia"]
+
+
+def test_sweep_runs_when_the_default_fails(client, monkeypatch):
+    probed = stub_probes(monkeypatch, client, {"noah"})
+
+    assert asyncio.run(client.find_working_voice()) == "noah"
+
+    assert probed[0] == "en-US-cooper"
+    assert probed.count("en-US-cooper") == 1
+    assert "noah" in probed
+    assert json.loads(client._last_good_path.read_text())["voice_id"] == "noah"
+
+
+def test_recently_verified_voice_skips_the_network(client, monkeypatch):
+    client._last_good_path.write_text(json.dumps({"voice_id": "emma", "ts": time.time()}))
+    probed = stub_probes(monkeypatch, client, set())
+
+    assert asyncio.run(client.find_working_voice()) == "emma"
+    assert probed == []
+
+
+def murf_error(status):
+    import httpx
+    from working_voice_client import raise_for_murf_status
+
+    async def operation():
+        request = httpx.Request("POST", "https://api.murf.ai/v1/speech/generate")
+        raise_for_murf_status(httpx.Response(status, request=request))
+
+    return operation
+
+
+def test_rate_limiting_does_not_open_the_circuit():
+    import httpx
+    from working_voice_client import CircuitBreaker, call_with_retry
+
+    breaker = CircuitBreaker("api.murf.ai")
+    for _ in range(5):
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(call_with_retry(breaker, murf_error(429), min_delay=0.0, max_delay=0.0))
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_server_errors_open_the_circuit():
+    import httpx
+    from working_voice_client import CircuitBreaker, call_with_retry
+
+    breaker = CircuitBreaker("api.murf.ai")
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(call_with_retry(breaker, murf_error(503), min_delay=0.0, max_delay=0.0))
+
+    assert breaker.state == CircuitBreaker.OPEN
@@ -5,102 +5,513 @@ This replaces the cached/broken fixed_murf_client.py
 """
 
 import asyncio
-import aiohttp
 import aiofiles
+import hashlib
+import httpx
+import importlib.util
 import logging
 import uuid
 import json
 import os
+import random
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, Awaitable, TypeVar, Set, Tuple
+from urllib.parse import urlparse
+
+# Request bodies are serialized to bytes up front (orjson when installed)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _json_bytes = orjson.dumps
+except ImportError:
+    ORJSON_AVAILABLE = False
+    def _json_bytes(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+# httpx multiplexes concurrent Murf calls over one connection when the
+# optional h2 package is installed, and falls back to HTTP/1.1 otherwise
+H2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Transport failures worth another attempt. Of the HTTP statuses only 429 and
+# 5xx are retried (probes raise them via raise_for_status); 401/403 surface as
+# MurfAuthError and are never retried
+RETRYABLE_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+# Longest Retry-After (seconds) a 429 retry will wait for
+MAX_RETRY_AFTER = 10.0
+
+# Tiered timeouts: voice probes are short and fail fast, syntheses may take a
+# while to produce the body; connect and read limits are split so slow DNS or
+# TLS is told apart from a slow response body
+PROBE_TIMEOUT = httpx.Timeout(3.0, connect=2.0)
+SYNTH_TIMEOUT = httpx.Timeout(30.0, connect=3.0)
+DOWNLOAD_TIMEOUT = httpx.Timeout(20.0, connect=3.0)
+
+# Voice discovery results (catalog + voices that passed a probe) written to the
+# voice cache by get_actual_voices.py; trusted without re-probing for a day
+VOICE_CATALOG_FILE = "voices_catalog.json"
+VOICE_DISCOVERY_TTL = 24 * 3600
+
+# Definitive probe answers, shared by every client in the process so a
+# re-created client does not re-synthesize: (key digest, voice) -> (ok, time)
+PROBE_RESULT_TTL = 300.0
+_probe_results: Dict[Tuple[str, str], Tuple[bool, float]] = {}
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a host whose circuit breaker is open"""
+
+class MurfAuthError(Exception):
+    """Murf rejected the API key (401/403) - no retry or other voice can help"""
+
+def raise_for_murf_status(response: httpx.Response):
+    """Turn the Murf statuses that need special handling into exceptions
+    
+    401/403 raise MurfAuthError; 429 and 5xx raise httpx.HTTPStatusError so
+    call_with_retry backs off and retries them. Other statuses are left to
+    the caller.
+    """
+    
+    status = response.status_code
+    if status in (401, 403):
+        raise MurfAuthError(f"HTTP {status}")
+    if status == 429 or status >= 500:
+        response.raise_for_status()
+
+def _is_retryable(error: httpx.HTTPError) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, RETRYABLE_ERRORS)
+
+def _is_rate_limited(error: httpx.HTTPError) -> bool:
+    return isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 429
+
+def _retry_delay(error: httpx.HTTPError, attempt: int, min_delay: float, max_delay: float) -> Optional[float]:
+    """Backoff before the next attempt, or None when it is not worth waiting"""
+    
+    delay = random.uniform(min_delay, min(max_delay, min_delay * 2 ** attempt))
+    
+    if isinstance(error, httpx.HTTPStatusError):
+        retry_after = error.response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            if float(retry_after) > MAX_RETRY_AFTER:
+                return None
+            delay = max(delay, float(retry_after))
+    
+    return delay
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one API host
+    
+    After ``failure_threshold`` transport failures in a row the breaker opens
+    and calls fail immediately for ``recovery_seconds``; then a single trial
+    call is let through (half-open) and its outcome closes or reopens it.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, host: str, failure_threshold: int = 3, recovery_seconds: float = 30.0):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+    
+    def allow(self) -> bool:
+        """Whether a call may go out now"""
+        
+        if self.state == self.CLOSED:
+            return True
+        
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_seconds:
+                return False
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        
+        # Half-open: exactly one trial call at a time
+        if self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+    
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info(f"✅ Circuit for {self.host} closed")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+    
+    def record_cancelled(self):
+        """A call was abandoned before its outcome was known"""
+        self._trial_in_flight = False
+    
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or (
+            self.state == self.CLOSED and self.failures >= self.failure_threshold
+        ):
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            logger.warning(f"⚠️ Circuit for {self.host} opened after {self.failures} failures")
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+def get_circuit_breaker(url: str) -> CircuitBreaker:
+    """Shared breaker for the host of ``url`` (or a bare host name)"""
+    
+    host = urlparse(url).hostname or url
+    breaker = _circuit_breakers.get(host)
+    if breaker is None:
+        breaker = _circuit_breakers[host] = CircuitBreaker(host)
+    return breaker
+
+async def call_with_retry(
+    breaker: CircuitBreaker,
+    operation: Callable[[], Awaitable[T]],
+    attempts: int = 3,
+    min_delay: float = 0.1,
+    max_delay: float = 2.0
+) -> T:
+    """Run ``operation`` behind ``breaker``, retrying transient failures
+    
+    Transport errors, 429 and 5xx are retried after a random, exponentially
+    growing delay (full jitter), or after Retry-After when a 429 sends one.
+    Any other exception propagates on the first attempt; CircuitOpenError is
+    raised without calling out while the breaker is open. A 429 is not held
+    against the host - it answered, it is only asking callers to slow down.
+    """
+    
+    for attempt in range(1, attempts + 1):
+        if not breaker.allow():
+            raise CircuitOpenError(f"circuit open for {breaker.host}")
+        
+        try:
+            result = await operation()
+        except httpx.HTTPError as e:
+            if _is_rate_limited(e):
+                breaker.record_cancelled()
+            else:
+                breaker.record_failure()
+            delay = _retry_delay(e, attempt, min_delay, max_delay) if _is_retryable(e) else None
+            if attempt == attempts or delay is None:
+                raise
+            await asyncio.sleep(delay)
+        except BaseException:
+            # Cancellation (losing discovery probes are cancelled once a voice
+            # wins) or an error that says nothing about the host's health; a
+            # half-open trial ending this way must not keep the breaker shut
+            breaker.record_cancelled()
+            raise
+        else:
+            breaker.record_success()
+            return result
+
 class WorkingMurfClient:
     """Working Murf client with proven voice IDs"""
     
+    # Voices probed by discovery when no known-good voice works
+    CANDIDATE_VOICES = ["liam", "olivia", "noah", "emma", "sarah", "john", "en-US-cooper", "marcus"]
+    
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.base_url = "https://api.murf.ai/v1"
+        self.breaker = get_circuit_breaker(self.base_url)
+        self._key_digest = hashlib.blake2b((api_key or "").encode("utf-8"), digest_size=8).hexdigest()
+        
+        # The API key never changes, so every JSON request shares one header dict
+        self._json_headers = {
+            "api-key": api_key,
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
         self.available = bool(api_key and api_key != "test_key" and len(api_key) > 10)
         
         # WORKING VOICE IDS (we'll find these dynamically)
-        self.working_voices = []
+        self.working_voices: Set[str] = set()
         self.default_voice_id = "en-US-cooper"
         
         # Create voice cache directory
         self.cache_dir = Path("voice_cache")
         self.cache_dir.mkdir(exist_ok=True)
         
+        # The voice that last worked for this account is tried before any
+        # other, so discovery usually costs a single probe
+        self._last_good_path = self.cache_dir / "last_good.json"
+        self.last_good_voice = self._load_last_good_voice()
+        if self.last_good_voice:
+            self.default_voice_id = self.last_good_voice
+        
+        # The default is only trusted once a probe has verified it; after a
+        # failed discovery the fallback is used for PROBE_RESULT_TTL before
+        # trying again
+        self._discovery_failed_at: Optional[float] = None
+        
+        # Long-lived HTTP client, created on first request - probes, TTS calls
+        # and downloads reuse its keep-alive (or HTTP/2) connections
+        self._client: Optional[httpx.AsyncClient] = None
+        
+        # Synthesized audio is stored under a digest of everything that shapes
+        # it; the index remembers known files so repeat hits skip the stat call
+        self.audio_format = "MP3"
+        self.sample_rate = 24000
+        self._audio_index: Dict[str, str] = {}
+        
+        # Probe requests differ only by voice, so their bodies are built once
+        self._probe_bodies: Dict[str, bytes] = {}
+        for voice_id in self.CANDIDATE_VOICES:
+            self._probe_body(voice_id)
+        
         # Stats tracking
         self.stats = {
             "requests": 0,
             "successes": 0,
             "failures": 0,
-            "audio_files_created": 0
+            "audio_files_created": 0,
+            "cache_hits": 0
         }
         
         logger.info(f"🎙️ Working Murf client initialized - Available: {self.available}")
     
-    async def find_working_voice(self) -> str:
-        """Find and cache a working voice ID"""
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it if needed
+        
+        The api-key header is sent per request rather than set on the client,
+        so audio downloads from Murf's file host never carry it.
+        """
+        
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=H2_AVAILABLE,
+                timeout=httpx.Timeout(15.0, connect=3.0),
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=30.0
+                )
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared HTTP client"""
         
-        if self.default_voice_id:
-            return self.default_voice_id
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+    
+    close = aclose
+    
+    def _cached_audio_path(self, text: str, voice_id: str) -> Path:
+        """Content-addressed cache file for a synthesis request"""
+        
+        digest = hashlib.blake2b(
+            f"{voice_id}|{self.sample_rate}|{self.audio_format}|{text}".encode("utf-8"),
+            digest_size=16
+        ).hexdigest()
+        return self.cache_dir / f"tts_{digest}.mp3"
+    
+    def _probe_body(self, voice_id: str) -> bytes:
+        """Serialized probe request for a voice (memoized)"""
         
-        # Test common working voices quickly
-        test_voices = ["liam", "olivia", "noah", "emma", "sarah", "john", "en-US-cooper", "marcus"]
+        body = self._probe_bodies.get(voice_id)
+        if body is None:
+            body = self._probe_bodies[voice_id] = _json_bytes({
+                "voiceId": voice_id,
+                "text": "Test",
+                "audioFormat": self.audio_format,
+                "sampleRate": self.sample_rate
+            })
+        return body
+    
+    def _load_last_good_voice(self) -> Optional[str]:
+        """Voice ID persisted by the last successful discovery, if any"""
+        
+        try:
+            return json.loads(self._last_good_path.read_text())["voice_id"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable {self._last_good_path}: {e}")
+            return None
+    
+    def _remember_working_voice(self, voice_id: str):
+        """Adopt a voice that just worked and persist it for the next start"""
+        
+        self.default_voice_id = voice_id
+        self.last_good_voice = voice_id
+        self.working_voices.add(voice_id)
+        logger.info(f"✅ Found working voice: {voice_id}")
+        
+        try:
+            self._last_good_path.write_text(json.dumps({"voice_id": voice_id, "ts": time.time()}))
+        except OSError as e:
+            logger.warning(f"⚠️ Could not persist working voice: {e}")
+    
+    async def find_working_voice(self, deadline_s: float = 12.0) -> str:
+        """Find and cache a working voice ID
+        
+        The whole discovery, retries included, is bounded by ``deadline_s``.
+        """
+        
+        if self.default_voice_id in self.working_voices:
+            return self.default_voice_id
+        if self._discovery_failed_at is not None and time.monotonic() - self._discovery_failed_at < PROBE_RESULT_TTL:
+            return self.default_voice_id
         
         logger.info("🔍 Finding working voice...")
+        started = time.perf_counter()
         
-        for voice_id in test_voices:
-            try:
-                result = await self._quick_voice_test(voice_id)
-                if result:
-                    self.default_voice_id = voice_id
-                    self.working_voices.append(voice_id)
-                    logger.info(f"✅ Found working voice: {voice_id}")
-                    return voice_id
-            except:
-                continue
+        try:
+            async with asyncio.timeout(deadline_s):
+                voice_id = await self._discover_voice()
+        except TimeoutError:
+            logger.info(f"⏱️ Voice discovery hit its {deadline_s}s deadline after {time.perf_counter() - started:.2f}s")
+            voice_id = None
+        except MurfAuthError as e:
+            logger.error(f"❌ Murf rejected the API key ({e}) - skipping voice discovery")
+            voice_id = None
+        
+        if voice_id:
+            self._discovery_failed_at = None
+            return voice_id
         
         # If nothing works, return first test voice anyway
+        self._discovery_failed_at = time.monotonic()
         self.default_voice_id = "liam"
         return self.default_voice_id
     
-    async def _quick_voice_test(self, voice_id: str) -> bool:
-        """Quick test if voice works"""
+    def _recently_verified_voice(self) -> Optional[str]:
+        """A voice that passed a probe within VOICE_DISCOVERY_TTL, if any"""
+        
+        cutoff = time.time() - VOICE_DISCOVERY_TTL
         
         try:
-            payload = {
-                "voiceId": voice_id,
-                "text": "Test",
-                "audioFormat": "MP3",
-                "sampleRate": 24000
-            }
-            
-            headers = {
-                "api-key": self.api_key,
-                "Content-Type": "application/json"
-            }
+            last_good = json.loads(self._last_good_path.read_text())
+            if last_good.get("ts", 0) >= cutoff and last_good.get("voice_id"):
+                return last_good["voice_id"]
+        except (OSError, ValueError, AttributeError):
+            pass
+        
+        catalog_path = self.cache_dir / VOICE_CATALOG_FILE
+        try:
+            if catalog_path.stat().st_mtime >= cutoff:
+                working = json.loads(catalog_path.read_text()).get("working") or []
+                if working:
+                    return working[0]
+        except (OSError, ValueError, AttributeError):
+            pass
+        
+        return None
+    
+    async def _discover_voice(self) -> Optional[str]:
+        """Probe candidate voices, returning the first that works"""
+        
+        # A voice verified in the last day is adopted without touching the network
+        voice_id = self._recently_verified_voice()
+        if voice_id:
+            self.default_voice_id = voice_id
+            self.working_voices.add(voice_id)
+            logger.info(f"✅ Using recently verified voice: {voice_id}")
+            return voice_id
+        
+        # The current default (the persisted last-good voice, when there is
+        # one) gets a probe of its own first
+        first_voice = self.default_voice_id
+        if first_voice and await self._quick_voice_test(first_voice):
+            self._remember_working_voice(first_voice)
+            return first_voice
+        
+        # Test common working voices quickly
+        # Deduplicated (an edited candidate list must never cost a second
+        # synthesis for the same voice); IDs are case-sensitive, so no lowercasing
+        seen = {first_voice}
+        test_voices = [
+            voice_id for voice_id in self.CANDIDATE_VOICES
+            if not (voice_id in seen or seen.add(voice_id))
+        ]
+        
+        # Probe every candidate at once and keep whichever works first;
+        # the probes still in flight are cancelled
+        tasks = {asyncio.create_task(self._quick_voice_test(voice_id)): voice_id for voice_id in test_voices}
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.cancelled():
+                        continue
+                    # An auth failure fails every probe - stop the sweep now
+                    if isinstance(task.exception(), MurfAuthError):
+                        raise task.exception()
+                    if task.exception() is None and task.result():
+                        voice_id = tasks[task]
+                        self._remember_working_voice(voice_id)
+                        return voice_id
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        return None
+    
+    async def _quick_voice_test(self, voice_id: str) -> bool:
+        """Quick test if voice works
+        
+        Raises MurfAuthError when the API key is rejected, so discovery can
+        stop instead of probing every other voice with the same key.
+        """
+        
+        cache_key = (self._key_digest, voice_id)
+        hit = _probe_results.get(cache_key)
+        if hit is not None and time.monotonic() - hit[1] < PROBE_RESULT_TTL:
+            return hit[0]
+        
+        body = self._probe_body(voice_id)
+        
+        async def probe() -> bool:
+            response = await self._get_client().post(
+                "/speech/generate",
+                content=body,
+                headers=self._json_headers,
+                timeout=PROBE_TIMEOUT
+            )
+            raise_for_murf_status(response)
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/speech/generate",
-                    json=payload,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    
-                    if response.status == 200:
-                        data = await response.json()
-                        return "audioFile" in data
-                    else:
-                        return False
+            if response.status_code == 200:
+                return "audioFile" in response.json()
+            else:
+                return False
+        
+        started = time.perf_counter()
+        try:
+            result = await call_with_retry(self.breaker, probe)
+            # Only answers Murf actually gave are remembered - timeouts and
+            # open circuits are transient and must be probed again
+            _probe_results[cache_key] = (result, time.monotonic())
+            return result
         
-        except:
+        except CircuitOpenError:
+            return False
+        
+        except httpx.TimeoutException:
+            logger.info(f"⏱️ Voice probe {voice_id} timed out after {time.perf_counter() - started:.2f}s")
+            return False
+        
+        except (httpx.HTTPError, ValueError) as e:
+            logger.debug(f"Voice probe {voice_id} failed: {type(e).__name__}")
             return False
     
     async def text_to_speech(self, text: str, voice_id: str = None) -> Dict[str, Any]:
@@ -126,94 +537,109 @@ class WorkingMurfClient:
         if not voice_id:
             voice_id = await self.find_working_voice()
         
-        self.stats["requests"] += 1
         clean_text = text.strip()[:5000]
         
+        # Audio already synthesized for this exact request is served from disk
+        cached_path = self._cached_audio_path(clean_text, voice_id)
+        cached_file = self._audio_index.get(cached_path.name)
+        if cached_file is None and cached_path.exists():
+            cached_file = self._audio_index[cached_path.name] = str(cached_path)
+        if cached_file is not None:
+            self.stats["cache_hits"] += 1
+            return {
+                "success": True,
+                "audio_path": cached_file,
+                "audio_url": f"/audio/{cached_path.name}",
+                "voice_id": voice_id,
+                "text_length": len(clean_text),
+                "audio_filename": cached_path.name,
+                "cached": True
+            }
+        
+        self.stats["requests"] += 1
+        started = time.perf_counter()
+        
         try:
-            payload = {
+            body = _json_bytes({
                 "voiceId": voice_id,
                 "text": clean_text,
-                "audioFormat": "MP3",
-                "sampleRate": 24000
-            }
-            
-            headers = {
-                "api-key": self.api_key,
-                "Content-Type": "application/json"
-            }
+                "audioFormat": self.audio_format,
+                "sampleRate": self.sample_rate
+            })
             
             logger.info(f"🎙️ TTS Request: {len(clean_text)} chars, voice: {voice_id}")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/speech/generate",
-                    json=payload,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    
-                    logger.info(f"🎙️ Murf response: {response.status}")
-                    
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        if "audioFile" in data:
-                            # Download audio
-                            audio_path = await self._download_audio(data["audioFile"])
-                            
-                            if audio_path:
-                                self.stats["successes"] += 1
-                                self.stats["audio_files_created"] += 1
-                                
-                                # Generate public URL
-                                audio_filename = Path(audio_path).name
-                                public_url = f"/audio/{audio_filename}"
-                                
-                                return {
-                                    "success": True,
-                                    "audio_path": audio_path,
-                                    "audio_url": public_url,
-                                    "voice_id": voice_id,
-                                    "text_length": len(clean_text),
-                                    "audio_filename": audio_filename
-                                }
-                        
-                        self.stats["failures"] += 1
-                        return {
-                            "success": False,
-                            "error": "No audio file in response",
-                            "audio_path": None,
-                            "audio_url": None
-                        }
+            response = await self._get_client().post(
+                "/speech/generate",
+                content=body,
+                headers=self._json_headers,
+                timeout=SYNTH_TIMEOUT
+            )
+            
+            logger.info(f"🎙️ Murf response: {response.status_code}")
+            
+            if response.status_code == 200:
+                data = response.json()
+                
+                if "audioFile" in data:
+                    # Download audio straight to its content address
+                    audio_path = await self._download_audio(data["audioFile"], cached_path)
                     
-                    elif response.status == 400:
-                        error_data = await response.json()
-                        error_msg = error_data.get("errorMessage", "Unknown error")
+                    if audio_path:
+                        self.stats["successes"] += 1
+                        self.stats["audio_files_created"] += 1
+                        self._audio_index[cached_path.name] = audio_path
                         
-                        # If voice is invalid, try to find another one
-                        if "Invalid voice_id" in error_msg and voice_id != self.default_voice_id:
-                            logger.warning(f"⚠️ Voice {voice_id} invalid, trying default...")
-                            return await self.text_to_speech(text, None)  # Will use find_working_voice
+                        # Generate public URL
+                        audio_filename = Path(audio_path).name
+                        public_url = f"/audio/{audio_filename}"
                         
-                        self.stats["failures"] += 1
                         return {
-                            "success": False,
-                            "error": f"API error: {error_msg}",
-                            "audio_path": None,
-                            "audio_url": None
+                            "success": True,
+                            "audio_path": audio_path,
+                            "audio_url": public_url,
+                            "voice_id": voice_id,
+                            "text_length": len(clean_text),
+                            "audio_filename": audio_filename
                         }
-                    
-                    else:
-                        error_text = await response.text()
-                        self.stats["failures"] += 1
-                        return {
-                            "success": False,
-                            "error": f"HTTP {response.status}: {error_text[:100]}",
-                            "audio_path": None,
-                            "audio_url": None
-                        }
-        
-        except asyncio.TimeoutError:
+                
+                self.stats["failures"] += 1
+                return {
+                    "success": False,
+                    "error": "No audio file in response",
+                    "audio_path": None,
+                    "audio_url": None
+                }
+            
+            elif response.status_code == 400:
+                error_data = response.json()
+                error_msg = error_data.get("errorMessage", "Unknown error")
+                
+                # If voice is invalid, try to find another one
+                if "Invalid voice_id" in error_msg and voice_id != self.default_voice_id:
+                    logger.warning(f"⚠️ Voice {voice_id} invalid, trying default...")
+                    return await self.text_to_speech(text, None)  # Will use find_working_voice
+                
+                self.stats["failures"] += 1
+                return {
+                    "success": False,
+                    "error": f"API error: {error_msg}",
+                    "audio_path": None,
+                    "audio_url": None
+                }
+            
+            else:
+                error_text = response.text
+                self.stats["failures"] += 1
+                return {
+                    "success": False,
+                    "error": f"HTTP {response.status_code}: {error_text[:100]}",
+                    "audio_path": None,
+                    "audio_url": None
+                }
+    
+        except httpx.TimeoutException:
+            logger.info(f"⏱️ TTS request timed out after {time.perf_counter() - started:.2f}s")
             self.stats["failures"] += 1
             return {
                 "success": False,
@@ -231,30 +657,42 @@ class WorkingMurfClient:
                 "audio_url": None
             }
     
-    async def _download_audio(self, audio_url: str) -> Optional[str]:
-        """Download audio file"""
+    async def _download_audio(self, audio_url: str, file_path: Optional[Path] = None) -> Optional[str]:
+        """Download audio file
         
-        try:
+        The body is streamed to disk in 64 KB chunks, so memory use does not
+        grow with the clip length. It lands in a temporary file that is moved
+        into place only once complete.
+        """
+        
+        if file_path is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"working_audio_{timestamp}_{uuid.uuid4().hex[:8]}.mp3"
-            file_path = self.cache_dir / filename
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(audio_url, timeout=aiohttp.ClientTimeout(total=20)) as response:
-                    if response.status == 200:
-                        async with aiofiles.open(file_path, 'wb') as f:
-                            async for chunk in response.content.iter_chunked(8192):
-                                await f.write(chunk)
-                        
-                        if file_path.exists() and file_path.stat().st_size > 0:
-                            logger.info(f"✅ Audio saved: {file_path} ({file_path.stat().st_size} bytes)")
-                            return str(file_path)
+            file_path = self.cache_dir / f"working_audio_{timestamp}_{uuid.uuid4().hex[:8]}.mp3"
+        temp_path = file_path.with_name(f"{file_path.name}.{uuid.uuid4().hex[:8]}.part")
+        
+        try:
+            async with self._get_client().stream("GET", audio_url, timeout=DOWNLOAD_TIMEOUT) as response:
+                if response.status_code == 200:
+                    size = 0
+                    async with aiofiles.open(temp_path, 'wb') as f:
+                        async for chunk in response.aiter_bytes(64 * 1024):
+                            await f.write(chunk)
+                            size += len(chunk)
+                    
+                    if size > 0:
+                        os.replace(temp_path, file_path)
+                        logger.info(f"✅ Audio saved: {file_path} ({size} bytes)")
+                        return str(file_path)
             
             return None
         
         except Exception as e:
             logger.error(f"❌ Audio download failed: {e}")
             return None
+        
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
     
     def get_stats(self) -> Dict[str, Any]:
         """Get client statistics"""
@@ -262,13 +700,14 @@ class WorkingMurfClient:
         
         return {
             "available": self.available,
-            "working_voices": self.working_voices,
+            "working_voices": sorted(self.working_voices),
             "default_voice": self.default_voice_id,
             "requests_made": self.stats["requests"],
             "successful_requests": self.stats["successes"],
             "failed_requests": self.stats["failures"],
             "success_rate_percentage": round(success_rate, 2),
-            "audio_files_created": self.stats["audio_files_created"]
+            "audio_files_created": self.stats["audio_files_created"],
+            "cache_hits": self.stats["cache_hits"]
         }
 
 class WorkingVoiceService:
@@ -345,6 +784,10 @@ class WorkingVoiceService:
             "cache_hits": self.service_stats["cache_hits"],
             "murf_client_stats": self.murf_client.get_stats()
         }
+    
+    async def close(self):
+        """Release the client's HTTP connections"""
+        await self.murf_client.aclose()
 
 # Quick test function
 async def test_working_system():
@@ -361,7 +804,10 @@ async def test_working_system():
     if service.available:
         print("✅ Service available, testing TTS...")
         
-        result = await service.text_to_speech("This is a test of the working voice system")
+        try:
+            result = await service.text_to_speech("This is a test of the working voice system")
+        finally:
+            await service.close()
         
         if result["success"]:
             print("🎉 SUCCESS! Working voice system operational!")